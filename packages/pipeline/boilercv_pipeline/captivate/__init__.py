@@ -6,3 +6,5 @@ FRAMERATE_CONT = 60
 """Framerate for continuous video output."""
 FRAMERATE_PREV = 3
 """Framerate for previews from multiple results, as in a slideshow."""
+WRITE_QUEUE_SIZE = 16
+"""Number of converted frames to buffer ahead of the video writer."""
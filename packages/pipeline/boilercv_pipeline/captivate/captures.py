@@ -1,42 +1,98 @@
 """Image and video capturing."""
 
+from collections.abc import Iterable
 from pathlib import Path
+from queue import Full, Queue
+from threading import Event, Thread
 from warnings import warn
 
 import imageio
-from numpy import integer, issubdtype
+from numpy import integer, issubdtype, unpackbits
 
+from boilercv.data import XPX_PACKED
 from boilercv.images import scale_bool
 from boilercv.types import DA, Img, ImgBool, Vid, VidBool
-from boilercv_pipeline.captivate import FFMPEG_LOG_LEVEL, FRAMERATE_CONT
+from boilercv_pipeline.captivate import (
+    FFMPEG_LOG_LEVEL,
+    FRAMERATE_CONT,
+    WRITE_QUEUE_SIZE,
+)
 
 
 def write_video(
     path: Path,
-    video: Vid | VidBool | DA,
+    video: Vid | VidBool | DA | Iterable[Img | ImgBool | DA],
     framerate: int = FRAMERATE_CONT,
     preview_frame: bool = False,
+    queue_size: int = WRITE_QUEUE_SIZE,
 ):
     """Write a video to disk with the default filetype and timestamp.
 
+    Frames are converted one at a time in a background thread and buffered in a bounded
+    queue ahead of the writer, so the whole converted video is never held in memory.
+
     Args:
         path: Path to the video file (suffix coerced to '.mp4').
-        video: Data structure to write as a video.
+        video: Data structure or iterable of frames to write as a video.
         framerate: Frames per second. Default: Package default framerate.
         preview_frame: Write the first frame to disk as an image. Default: False.
+        queue_size: Number of converted frames to buffer ahead of the writer.
     """
-    video = coerce_input(video)
     if path.suffix and path.suffix != ".mp4":
         warn(f"Changing extesion of {path}  to '.mp4'.", stacklevel=2)
     path = path.with_suffix(".mp4")
-    writer = imageio.get_writer(
-        uri=path, fps=framerate, macro_block_size=8, ffmpeg_log_level=FFMPEG_LOG_LEVEL
-    )
-    for image in video:
-        writer.append_data(image)
-    writer.close()
-    if preview_frame:
-        write_image(path.with_suffix(".png"), video[0])
+    images: Queue[Img | BaseException | None] = Queue(maxsize=queue_size)
+    stop = Event()
+    converter = Thread(target=convert_frames, args=(video, images, stop), daemon=True)
+    converter.start()
+    first_image: Img | None = None
+    try:
+        with imageio.get_writer(
+            uri=path,
+            fps=framerate,
+            macro_block_size=8,
+            ffmpeg_log_level=FFMPEG_LOG_LEVEL,
+        ) as writer:
+            while (image := images.get()) is not None:
+                if isinstance(image, BaseException):
+                    raise image
+                if first_image is None:
+                    first_image = image
+                writer.append_data(image)
+    finally:
+        stop.set()
+        converter.join()
+    if preview_frame and first_image is not None:
+        write_image(path.with_suffix(".png"), first_image)
+
+
+def convert_frames(
+    video: Vid | VidBool | DA | Iterable[Img | ImgBool | DA],
+    images: Queue[Img | BaseException | None],
+    stop: Event,
+):
+    """Convert frames to images and put them in a queue, ending with `None`.
+
+    Exceptions are put in the queue instead of raised. Stops early if the event is set.
+    """
+
+    def put(item: Img | BaseException | None):
+        while not stop.is_set():
+            try:
+                images.put(item, timeout=0.1)
+            except Full:
+                continue
+            return
+
+    try:
+        for frame in video:
+            if stop.is_set():
+                return
+            put(coerce_input(frame))
+    except BaseException as exc:
+        put(exc)
+        return
+    put(None)
 
 
 def write_image(path: Path, image: Img | ImgBool | DA):
@@ -56,9 +112,13 @@ def write_image(path: Path, image: Img | ImgBool | DA):
 def coerce_input(imgs: Img | ImgBool | DA) -> Img:
     """Coerce input image or video to the appropriate type.
 
+    Packed images or videos are unpacked.
+
     Args:
         imgs: Image or video to coerce.
     """
+    if isinstance(imgs, DA) and XPX_PACKED in imgs.dims:
+        imgs = unpackbits(imgs.values, axis=imgs.dims.index(XPX_PACKED)).astype(bool)
     if issubdtype(imgs.dtype, integer):
         viewable: Img = imgs.values if isinstance(imgs, DA) else imgs  # pyright: ignore[reportAssignmentType]
     elif issubdtype(imgs.dtype, bool):
@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from cappa.subcommand import Subcommands
 
 from boilercv_pipeline.cli.experiments import Trackpy
+from boilercv_pipeline.run import Run
 from boilercv_pipeline.stages.binarize import Binarize
 from boilercv_pipeline.stages.convert import Convert
 from boilercv_pipeline.stages.fill import Fill
@@ -51,4 +52,4 @@ class Exp:
 class BoilercvPipeline:
     """Run the research data pipeline."""
 
-    commands: Subcommands[SyncDvc | Stage | Exp]
+    commands: Subcommands[SyncDvc | Stage | Run | Exp]
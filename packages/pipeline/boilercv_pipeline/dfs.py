@@ -1,13 +1,35 @@
 """Data frame operations."""
 
 from pathlib import Path
+from typing import Literal, TypeAlias
 
 from numpy import histogram, sqrt
-from pandas import DataFrame, NamedAgg
+from pandas import DataFrame, HDFStore, NamedAgg
+from pyarrow import Table, schema, string
+from pyarrow.compute import Expression
+from pyarrow.dataset import Dataset, Partitioning, dataset, partitioning, write_dataset
 from sparklines import sparklines
 
 from boilercv_pipeline.models.df import GBC, WIDTH
 
+Complib: TypeAlias = Literal[
+    "zlib",
+    "lzo",
+    "bzip2",
+    "blosc",
+    "blosc:blosclz",
+    "blosc:lz4",
+    "blosc:lz4hc",
+    "blosc:snappy",
+    "blosc:zlib",
+    "blosc:zstd",
+]
+"""HDF5 compression libraries supported by PyTables."""
+COMPLIB: Complib = "blosc:zstd"
+"""Default compression library, much faster than `zlib` at a similar ratio."""
+COMPLEVEL = 5
+"""Default compression level."""
+
 
 def sparkhist(grp: DataFrame) -> str:
     """Render a sparkline histogram."""
@@ -26,17 +48,84 @@ def get_hists(df: DataFrame, groupby: str, cols: list[str]) -> DataFrame:
     return df.assign(**{col: df[col].str.center(WIDTH, "▁") for col in cols})
 
 
-def save_df(df: DataFrame, path: Path | str, key: str | None = None):
+def save_df(
+    df: DataFrame,
+    path: Path | str,
+    key: str | None = None,
+    complib: Complib = COMPLIB,
+    complevel: int = COMPLEVEL,
+):
     """Save data frame to a compressed HDF5 file."""
     path = Path(path)
-    df.to_hdf(path, key=key or path.stem, complib="zlib", complevel=9)
+    save_dfs({key or path.stem: df}, path, complib=complib, complevel=complevel)
 
 
-def save_dfs(dfs: dict[str, DataFrame], path: Path | str, key: str | None = None):
-    """Save data frame to a compressed HDF5 file."""
-    path = Path(path)
-    for key, df in dfs.items():
-        save_df(df, path, key=key)
+def save_dfs(
+    dfs: dict[str, DataFrame],
+    path: Path | str,
+    complib: Complib = COMPLIB,
+    complevel: int = COMPLEVEL,
+):
+    """Save data frames to a compressed HDF5 file in a single write session.
+
+    Files are readable by `pandas.read_hdf` with any codec. Pass `complib="zlib"` and
+    `complevel=9` to write files readable without Blosc support in PyTables.
+    """
+    with HDFStore(Path(path), mode="w", complib=complib, complevel=complevel) as store:
+        for key, df in dfs.items():
+            store.put(key, df)
+
+
+def append_partition(
+    df: DataFrame, path: Path | str, partition: str, key: str = "time"
+):
+    """Write a data frame as one partition of a columnar dataset.
+
+    Replaces the partition if it already exists, leaving other partitions untouched.
+    """
+    write_dataset(
+        data=Table.from_pandas(df.assign(**{key: partition}), preserve_index=False),
+        base_dir=path,
+        format="parquet",
+        partitioning=get_partitioning(key),
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="delete_matching",
+    )
+
+
+def scan_partitions(path: Path | str, key: str = "time") -> Dataset:
+    """Lazily scan a partitioned columnar dataset."""
+    return dataset(path, format="parquet", partitioning=get_partitioning(key))
+
+
+def get_partitions(path: Path | str, key: str = "time") -> set[str]:
+    """Get partitions written to a columnar dataset, if it exists."""
+    if not Path(path).exists():
+        return set()
+    return set(
+        scan_partitions(path, key).to_table(columns=[key]).column(key).to_pylist()
+    )
+
+
+def load_partitions(
+    path: Path | str,
+    columns: list[str] | None = None,
+    filter: Expression | None = None,
+    key: str = "time",
+) -> DataFrame:
+    """Load columns of a partitioned columnar dataset, filtered as they're read.
+
+    Filters on the partition key skip whole partitions, and filters on other columns
+    skip row groups whose statistics rule them out.
+    """
+    return (
+        scan_partitions(path, key).to_table(columns=columns, filter=filter).to_pandas()
+    )
+
+
+def get_partitioning(key: str = "time") -> Partitioning:
+    """Get partitioning of a columnar dataset into directories by a string key."""
+    return partitioning(schema([(key, string())]), flavor="hive")
 
 
 def limit_group_size(df: DataFrame, by: str | list[str], n: int) -> DataFrame:
@@ -1,52 +1,229 @@
-"""Blob detection examples."""
+"""Blob detection examples.
 
-from dataclasses import dataclass
-from math import sqrt
+Blobs are found in all frames of a video at once, in a scale space built from a single
+Gaussian pyramid of the video, filtered across frames but not between them. Blobs of
+all frames are returned together in a structured array of `(frame, y, x, r)`.
+"""
 
-from skimage.draw import disk, set_color
-from skimage.feature import blob_dog, blob_doh, blob_log
+from itertools import pairwise
+from math import log, sqrt
 
+from numpy import (
+    arange,
+    arccos,
+    argwhere,
+    broadcast_to,
+    clip,
+    dtype,
+    empty,
+    float32,
+    float64,
+    geomspace,
+    iinfo,
+    int64,
+    integer,
+    issubdtype,
+    lexsort,
+    linspace,
+    meshgrid,
+    ones,
+    pi,
+    stack,
+    where,
+    zeros,
+)
+from numpy.typing import NDArray
+from scipy.ndimage import correlate1d, gaussian_filter, maximum_filter
+from scipy.spatial import cKDTree
+
+from boilercv.types import ArrBool, ArrFloat, Img, Vid
+
+BLOB = dtype([("frame", int64), ("y", int64), ("x", int64), ("r", float64)])
+"""Blobs found in each frame, with their centers and radii in pixels."""
+Blobs = NDArray
+"""Structured array of blobs."""
+
+
+def get_blobs_log(
+    video: Vid,
+    min_sigma: float = 1,
+    max_sigma: float = 30,
+    num_sigma: int = 10,
+    threshold: float = 0.1,
+    overlap: float = 0.5,
+) -> Blobs:
+    """Get blobs using the Laplacian of Gaussian technique."""
+    sigmas = linspace(min_sigma, max_sigma, num_sigma)
+    # Scale-normalized Laplacians of each level of the pyramid, bright blobs positive
+    cube = stack([
+        -(sigma**2) * (diff2(level, -2) + diff2(level, -1))
+        for sigma, level in zip(sigmas, get_pyramid(video, sigmas), strict=True)
+    ])
+    return find_blobs(cube, sigmas, sqrt(2), threshold, overlap)
 
-def get_blobs_dog(image):
-    """Get blobs using the dog technique."""
-    blobs = blob_dog(
-        image
-        # max_sigma=30,
-        # threshold=0.1,
-    )
-    blobs[:, 2] *= sqrt(2)
-    return (Blob(*blob) for blob in blobs)
 
+def get_blobs_dog(
+    video: Vid,
+    min_sigma: float = 1,
+    max_sigma: float = 50,
+    sigma_ratio: float = 1.6,
+    threshold: float = 0.5,
+    overlap: float = 0.5,
+) -> Blobs:
+    """Get blobs using the Difference of Gaussian technique."""
+    num_sigma = int(log(max_sigma / min_sigma) / log(sigma_ratio)) + 1
+    sigmas = geomspace(min_sigma, min_sigma * sigma_ratio**num_sigma, num_sigma + 1)
+    # Differences of adjacent levels approximate scale-normalized Laplacians
+    pyramid = get_pyramid(video, sigmas)
+    cube = stack([
+        (finer - coarser) / (sigma_ratio - 1) for finer, coarser in pairwise(pyramid)
+    ])
+    return find_blobs(cube, sigmas[:-1], sqrt(2), threshold, overlap)
 
-def get_blobs_log(image):
-    """Get blobs using the log technique."""
-    blobs = blob_log(image, max_sigma=30, num_sigma=10, threshold=0.1)
-    blobs[:, 2] *= sqrt(2)
-    return (Blob(*blob) for blob in blobs)
 
+def get_blobs_doh(
+    video: Vid,
+    min_sigma: float = 1,
+    max_sigma: float = 30,
+    num_sigma: int = 10,
+    threshold: float = 0.01,
+    overlap: float = 0.5,
+) -> Blobs:
+    """Get blobs using the Determinant of Hessian technique."""
+    sigmas = linspace(min_sigma, max_sigma, num_sigma)
+    cube = stack([
+        sigma**4
+        * (diff2(level, -2) * diff2(level, -1) - diff1(diff1(level, -2), -1) ** 2)
+        for sigma, level in zip(sigmas, get_pyramid(video, sigmas), strict=True)
+    ])
+    return find_blobs(cube, sigmas, 1, threshold, overlap)
 
-def get_blobs_doh(image):
-    """Get blobs using the doh technique."""
-    blobs = blob_doh(
-        image
-        # min_sigma=1,
-        # max_sigma=30,
-        # threshold=0.01,
-        # overlap=0.30,
+
+def get_pyramid(video: Vid, sigmas: ArrFloat) -> list[ArrFloat]:
+    """Get a Gaussian pyramid of a video, smoothing frames but not between them.
+
+    Sigmas must increase.
+    """
+    video = video.reshape(-1, *video.shape[-2:])
+    images = (
+        video.astype(float32) / iinfo(video.dtype).max
+        if issubdtype(video.dtype, integer)
+        else video.astype(float32)
     )
-    return (Blob(*blob) for blob in blobs)
+    # Smooth each level from the last, by the sigma that adds up to the level's sigma.
+    # Increments are much smaller than the sigmas themselves, and so are their kernels.
+    pyramid: list[ArrFloat] = []
+    for sigma, previous in zip(sigmas, [0, *sigmas[:-1]], strict=True):
+        increment = sqrt(sigma**2 - previous**2)
+        pyramid.append(
+            gaussian_filter(
+                pyramid[-1] if pyramid else images, sigma=(0, increment, increment)
+            )
+        )
+    return pyramid
+
+
+def diff1(images: ArrFloat, axis: int) -> ArrFloat:
+    """Get central first differences of images along an axis."""
+    return correlate1d(images, [-0.5, 0, 0.5], axis=axis, mode="reflect")
 
 
-@dataclass
-class Blob:
-    """Blob."""
+def diff2(images: ArrFloat, axis: int) -> ArrFloat:
+    """Get second differences of images along an axis."""
+    return correlate1d(images, [1, -2, 1], axis=axis, mode="reflect")
 
-    y: int
-    x: int
-    r: int
+
+def find_blobs(
+    cube: ArrFloat,
+    sigmas: ArrFloat,
+    radius_per_sigma: float,
+    threshold: float,
+    overlap: float,
+) -> Blobs:
+    """Find blobs at local maxima of a scale space with dimensions (scale, frame, y, x).
+
+    Maxima are local in scale and space, but not between frames. Blobs overlapping
+    larger blobs in the same frame by more than a fraction `overlap` are pruned.
+    """
+    maxima = maximum_filter(cube, size=(3, 1, 3, 3), mode="nearest")
+    scales, frames, y, x = argwhere((cube == maxima) & (cube > threshold)).T
+    kept = prune_blobs(frames, y, x, sigmas[scales] * sqrt(2), overlap)
+    blobs = empty(kept.sum(), dtype=BLOB)
+    blobs["frame"], blobs["y"], blobs["x"] = frames[kept], y[kept], x[kept]
+    blobs["r"] = sigmas[scales[kept]] * radius_per_sigma
+    return blobs
+
+
+def prune_blobs(
+    frames: Img, y: Img, x: Img, radii: ArrFloat, overlap: float
+) -> ArrBool:
+    """Get blobs to keep, pruning those overlapping larger blobs in the same frame.
+
+    Pruning is greedy from the largest blob down, decided in rounds across all frames.
+    Each round keeps blobs not overlapping any larger undecided blob, and prunes blobs
+    that overlap them.
+    """
+    kept = ones(frames.size, dtype=bool)
+    if not frames.size:
+        return kept
+    # Separate frames in space so that blobs in different frames are never paired
+    spacing = 4 * radii.max() + max(y.max(), x.max()) + 1
+    pairs = cKDTree(stack([frames * spacing, y, x], axis=-1)).query_pairs(
+        r=2 * radii.max(), output_type="ndarray"
+    )
+    i, j = pairs.T
+    overlapping = get_overlaps(y[i] - y[j], x[i] - x[j], radii[i], radii[j]) > overlap
+    i, j = i[overlapping], j[overlapping]
+    # Rank blobs by radius, orienting pairs so that the first blob outranks the second
+    ranks = empty(frames.size, dtype=int64)
+    ranks[lexsort((arange(frames.size), radii))] = arange(frames.size)
+    i, j = where(ranks[i] > ranks[j], i, j), where(ranks[i] > ranks[j], j, i)
+    undecided = ones(frames.size, dtype=bool)
+    while i.size:
+        outranked = zeros(frames.size, dtype=bool)
+        outranked[j] = True
+        winners = undecided & ~outranked
+        pruned = zeros(frames.size, dtype=bool)
+        pruned[j[winners[i]]] = True
+        kept &= ~pruned
+        undecided &= ~winners & ~pruned
+        remaining = undecided[i] & undecided[j]
+        i, j = i[remaining], j[remaining]
+    return kept
+
+
+def get_overlaps(dy: Img, dx: Img, r1: ArrFloat, r2: ArrFloat) -> ArrFloat:
+    """Get the area of intersection of pairs of disks over the area of the smaller."""
+    d = (dy**2 + dx**2) ** 0.5
+    # Clip distances from zero to avoid dividing by zero. Concentric disks are handled
+    # by the containment case anyways.
+    dc = clip(d, 1e-12, None)
+    area = (
+        r1**2 * arccos(clip((dc**2 + r1**2 - r2**2) / (2 * dc * r1), -1, 1))
+        + r2**2 * arccos(clip((dc**2 + r2**2 - r1**2) / (2 * dc * r2), -1, 1))
+        - 0.5
+        * abs((-dc + r1 + r2) * (dc - r1 + r2) * (dc + r1 - r2) * (dc + r1 + r2)) ** 0.5
+    )
+    smaller = pi * where(r1 < r2, r1, r2) ** 2
+    return where(d >= r1 + r2, 0, where(d <= abs(r1 - r2), 1, area / smaller))
 
 
-def draw_blobs(result, blob, color):
-    """Draw blobs."""
-    rr, cc = disk((int(blob.y), int(blob.x)), int(blob.r))
-    set_color(result, (rr, cc), color)
+def draw_blobs(images: Img, blobs: Blobs, color: int | tuple[int, ...]) -> Img:
+    """Draw blobs as filled disks onto their frames, all at once."""
+    images = images.copy()
+    height, width = images.shape[1:3]
+    radii = blobs["r"].astype(int64)
+    mask = zeros(images.shape[:3], dtype=bool)
+    # Draw blobs of each radius together, offsetting their centers by the same disk
+    for radius in set(radii.tolist()):
+        offsets = arange(-radius, radius + 1)
+        dy, dx = (o.ravel() for o in meshgrid(offsets, offsets, indexing="ij"))
+        disk = dy**2 + dx**2 < radius**2
+        same = blobs[radii == radius]
+        ys = same["y"][:, None] + dy[disk]
+        xs = same["x"][:, None] + dx[disk]
+        inside = (ys >= 0) & (ys < height) & (xs >= 0) & (xs < width)
+        frames = broadcast_to(same["frame"][:, None], ys.shape)
+        mask[frames[inside], ys[inside], xs[inside]] = True
+    images[mask] = color
+    return images
@@ -23,11 +23,11 @@ def main():
         "Determinant of Hessian": get_blobs_doh,
     }
     blobs = {title: func(image_gray) for title, func in operations.items()}
-    results: dict[str, ArrInt] = {}
-    for (title, blobs_), color in zip(blobs.items(), [RED, GREEN, BLUE], strict=True):
-        results[title] = image.copy()
-        for blob in blobs_:
-            draw_blobs(results[title], blob, color)
+    colors = [RED, GREEN, BLUE]
+    results: dict[str, ArrInt] = {
+        title: draw_blobs(image[None], blobs_, color)[0]
+        for (title, blobs_), color in zip(blobs.items(), colors, strict=True)
+    }
     view_images({"input": image} | results)
 
 
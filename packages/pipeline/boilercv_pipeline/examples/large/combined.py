@@ -1,9 +1,10 @@
 """Perform all of the steps."""
 
-from boilercv.data import FRAME, VIDEO, apply_to_img_da
-from boilercv.data.packing import pack
+from boilercv.data import VIDEO, apply_to_img_da
+from boilercv.data.packing import pack, unpack
+from boilercv.data.reductions import max_frames
 from boilercv.images import scale_bool
-from boilercv.images.cv import apply_mask, binarize, close_and_erode, flood
+from boilercv.images.cv import binarize_video, close_and_erode, flood
 from boilercv.types import DA
 from boilercv_pipeline import DEBUG
 from boilercv_pipeline.captivate.previews import view_images
@@ -15,12 +16,13 @@ def main():
         destination="combined", preview=DEBUG, encoding={VIDEO: {"zlib": True}}
     ) as ds:
         video = ds[VIDEO]
-        maximum = video.max(FRAME)
+        maximum = max_frames(video)
         flooded: DA = apply_to_img_da(flood, maximum)
         roi = apply_to_img_da(close_and_erode, scale_bool(flooded))
-        masked: DA = apply_to_img_da(apply_mask, video, scale_bool(roi), vectorize=True)
-        binarized: DA = apply_to_img_da(binarize, masked, vectorize=True)
-        ds[VIDEO] = pack(binarized)
+        # Same as `apply_mask` for binary masks, broadcast over all frames
+        masked: DA = video | scale_bool(~roi)
+        ds[VIDEO] = pack(masked, binarize_video)
+        binarized = unpack(ds[VIDEO].isel(frame=[0]))
         view_images(
             dict(
                 video=video.isel(frame=0),
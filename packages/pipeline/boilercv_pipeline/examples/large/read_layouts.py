@@ -0,0 +1,55 @@
+"""Benchmark reading ranges of frames from videos written with different layouts.
+
+Copies of an example video are written with the netCDF library's default chunking, and
+with layouts chunked along frames. Ranges of frames are then read from each copy, like
+`boilercv_pipeline.sets.load_video` does.
+"""
+
+from statistics import median
+from time import perf_counter
+
+from loguru import logger
+from numpy.random import default_rng
+from xarray import open_dataset
+
+from boilercv.data import FRAME, VIDEO
+from boilercv_pipeline.examples import EXAMPLE_NUM_FRAMES, EXAMPLE_VIDEO_NAME
+from boilercv_pipeline.models.paths import paths
+from boilercv_pipeline.sets import Layout, get_encoding
+
+SOURCE = paths.sources / f"{EXAMPLE_VIDEO_NAME}.nc"
+LAYOUTS: dict[str, Layout | None] = {
+    "default": None,
+    **{f"{frames}_frames": Layout(chunk_frames=frames) for frames in (1, 8, 32, 128)},
+    "32_frames_uncompressed": Layout(chunk_frames=32, codec="none"),
+}
+NUM_READS = 10
+
+
+def main():
+    with open_dataset(SOURCE) as ds:
+        video = ds[VIDEO].load()
+    starts = default_rng(0).integers(
+        0, max(video.sizes[FRAME] - EXAMPLE_NUM_FRAMES, 1), NUM_READS
+    )
+    megabytes = video.isel({FRAME: slice(EXAMPLE_NUM_FRAMES)}).nbytes / 1e6
+    for name, layout in LAYOUTS.items():
+        destination = paths.large_examples / f"{SOURCE.stem}_{name}.nc"
+        video.to_dataset().to_netcdf(
+            path=destination,
+            encoding={VIDEO: get_encoding(video, layout) if layout else {"zlib": True}},
+        )
+        times: list[float] = []
+        for start in starts:
+            with open_dataset(destination) as ds:
+                begin = perf_counter()
+                ds[VIDEO].isel({FRAME: slice(start, start + EXAMPLE_NUM_FRAMES)}).load()
+                times.append(perf_counter() - begin)
+        logger.info(
+            f"{name}: {destination.stat().st_size / 1e6:.1f} MB on disk,"
+            f" {megabytes / median(times):.0f} MB/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,10 @@ from boilercv.images import overlay, scale_bool
 from boilercv_pipeline import PREVIEW, WRITE
 from boilercv_pipeline.captivate.captures import write_image
 from boilercv_pipeline.captivate.previews import view_images
-from boilercv_pipeline.examples.detect_surface import find_boiling_surface
 from boilercv_pipeline.examples.previews import _EXAMPLE
 from boilercv_pipeline.models.paths import paths
 from boilercv_pipeline.sets import get_dataset
+from boilercv_pipeline.surface import draw_surfaces, find_surfaces
 
 
 def main():
@@ -20,7 +20,7 @@ def main():
     roi = ds[ROI].values
     highlighted_roi = overlay(gray, scale_bool(roi), color=BLUE, alpha=0.2)
 
-    surface, _ = find_boiling_surface(scale_bool(roi))
+    surface = draw_surfaces(find_surfaces(scale_bool(roi)), roi.shape)[0]
     highlighted_surface = overlay(
         highlighted_roi, scale_bool(surface), color=RED, alpha=1
     )
@@ -0,0 +1,163 @@
+"""Multi-start model fits, run in parallel and cached by model and data."""
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from hashlib import sha256
+from importlib import import_module
+from inspect import getsource
+from multiprocessing import get_context
+from numbers import Number
+from pathlib import Path
+from typing import Any
+
+from boilercore.fits import fit
+from boilercore.models.fit import Fit
+from numpy import argmin, array, ascontiguousarray, inf, isnan, logspace, ndarray, where
+from pydantic import BaseModel
+
+from boilercv_pipeline.models.paths import paths
+
+GUESSES = logspace(-2, 0)
+"""Initial guesses for free parameters, each tried in turn."""
+
+
+class CachedFit(BaseModel):
+    """Cached fits and errors."""
+
+    fits: dict[str, float]
+    """Fitted parameters."""
+    errors: dict[str, float]
+    """Fit errors."""
+
+
+def fit_multistart(
+    model: Callable[..., Any],
+    params: Fit,
+    x: Any,
+    y: Any,
+    guesses: Iterable[float] = GUESSES,
+    cache: Path | None = paths.fits,
+    max_workers: int | None = None,
+) -> tuple[dict[str, float], dict[str, float]]:
+    """Fit a model starting from each guess in parallel, keeping the best fit.
+
+    The best fit has the least sum of squared residuals, evaluated for all guesses at
+    once. Fits are cached by model and data, so unchanged fits are loaded, not refit.
+    Worker processes are spawned, so models must be importable to fit in parallel.
+    Models that aren't, such as those defined in notebooks, are fit in-process, as are
+    all models if `max_workers` is one.
+    """
+    guesses = list(guesses)
+    path = (
+        cache / f"{model.__name__}_{hash_fit(model, params, guesses, x, y)}.json"
+        if cache
+        else None
+    )
+    if path and path.exists():
+        cached = CachedFit.model_validate_json(path.read_text(encoding="utf-8"))
+        return cached.fits, cached.errors
+    fit_guess = partial(
+        fit,
+        model,
+        params.fixed_values,
+        params.free_params,
+        model_bounds=params.model_bounds,
+        x=x,
+        y=y,
+    )
+    starts = [dict.fromkeys(params.free_params, guess) for guess in guesses]
+    if max_workers == 1 or not is_importable(model):
+        results = [fit_guess(start) for start in starts]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=get_context("spawn")
+        ) as executor:
+            results = list(executor.map(fit_guess, starts))
+    fits = array([f for f, _errors in results])
+    best = argmin(
+        get_sums_of_squares(model, params.fixed_values, params.free_params, fits, x, y)
+    )
+    best_fits, best_errors = results[best]
+    cached = CachedFit(
+        fits=dict(zip(params.free_params, best_fits, strict=True)),
+        errors={
+            f"{param}_err": error
+            for param, error in zip(params.free_params, best_errors, strict=True)
+        },
+    )
+    if path:
+        path.write_text(encoding="utf-8", data=cached.model_dump_json(indent=2))
+    return cached.fits, cached.errors
+
+
+def get_sums_of_squares(
+    model: Callable[..., Any],
+    fixed_values: dict[str, Any],
+    free_params: list[str],
+    fits: ndarray,
+    x: Any,
+    y: Any,
+) -> ndarray:
+    """Get sums of squared residuals of many fits, evaluated all at once.
+
+    Fits are rows of free parameters, each broadcast against all of the data. Failed
+    fits have infinite residuals.
+    """
+    residuals = (
+        model(
+            x,
+            **fixed_values,
+            **{param: fits[:, [i]] for i, param in enumerate(free_params)},
+        )
+        - y
+    )
+    sums = (residuals**2).sum(axis=-1)
+    return where(isnan(sums), inf, sums)
+
+
+def is_importable(func: Callable[..., Any]) -> bool:
+    """Check whether worker processes can import a function by its module and name."""
+    module = getattr(func, "__module__", None)
+    qualname = getattr(func, "__qualname__", "")
+    if not module or module == "__main__" or "<locals>" in qualname:
+        return False
+    try:
+        obj = import_module(module)
+        for attr in qualname.split("."):
+            obj = getattr(obj, attr)
+    except (ImportError, AttributeError):
+        return False
+    return obj is func
+
+
+def hash_fit(
+    model: Callable[..., Any], params: Fit, guesses: list[float], x: Any, y: Any
+) -> str:
+    """Hash a model, its fit parameters, guesses, and data.
+
+    The model's source is hashed along with any numbers or arrays it refers to, such as
+    notebook-level constants.
+    """
+    h = sha256()
+    try:
+        h.update(getsource(model).encode("utf-8"))
+    except (OSError, TypeError):
+        h.update(model.__qualname__.encode("utf-8"))
+    for name in model.__code__.co_names:
+        value = model.__globals__.get(name)
+        if isinstance(value, ndarray):
+            h.update(ascontiguousarray(value).tobytes())
+        elif isinstance(value, Number):
+            h.update(f"{name}={value!r}".encode())
+    h.update(
+        repr((
+            params.fixed_values,
+            params.free_params,
+            params.model_bounds,
+            guesses,
+        )).encode("utf-8")
+    )
+    for data in (x, y):
+        h.update(ascontiguousarray(data).tobytes())
+    return h.hexdigest()[:16]
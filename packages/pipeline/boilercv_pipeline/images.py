@@ -125,6 +125,35 @@ def get_image_boundaries(img) -> tuple[tuple[int, int], tuple[int, int]]:
     return ylim, xlim
 
 
+def get_bounding_slices(
+    img: Img, pad_width: int = 0, col_multiple: int = 1
+) -> tuple[slice, slice]:
+    """Get slices bounding nonzero elements of an image, padded within the image.
+
+    Columns are rounded out to multiples of `col_multiple` from the left of the image,
+    such as to pack whole bytes of bits along them. Only slices reaching the right of
+    the image may be narrower.
+    """
+    rows, cols = (where(numpy.any(img, axis=axis))[0] for axis in (1, 0))
+    if not rows.size:
+        return slice(None), slice(None)
+    height, width = img.shape[:2]
+    col_start = max(cols[0] - pad_width, 0)
+    col_stop = cols[-1] + 1 + pad_width
+    return (
+        slice(max(rows[0] - pad_width, 0), min(rows[-1] + 1 + pad_width, height)),
+        slice(
+            col_start - col_start % col_multiple,
+            min(col_stop + -col_stop % col_multiple, width),
+        ),
+    )
+
+
+def get_offsets(da: DA) -> list[int]:
+    """Get pixel coordinates of the top-left pixel of images, which may be cropped."""
+    return [int(da[dim][0]) for dim in (YPX, XPX)]
+
+
 @contextmanager
 def bounded_ax(img: Img, ax: Axes | None = None) -> Iterator[Axes]:
     """Show only the region bounding nonzero elements of the image."""
@@ -37,6 +37,8 @@ class Constants(BaseModel):
     paper_scale: float = 1.0
     precision: int = 3
     display_rows: int = 12
+    headless: bool = False
+    """Skip displaying previews, e.g. when running notebooks from stages."""
 
 
 const = Constants()
@@ -92,6 +94,8 @@ def display_markdown(df: DataFrame, floatfmt: str = "#.3g"):
     -----
     https://github.com/jupyter-book/jupyter-book/issues/1501#issuecomment-2301641068
     """
+    if const.headless:
+        return
     display(Markdown(df.to_markdown(floatfmt=floatfmt)))
 
 
@@ -168,8 +172,9 @@ class Params(Stage, Generic[Deps_T, Outs_T]):
         **kwds: Ps.kwargs,
     ) -> DfOrS_T:
         """Preview a dataframe in the notebook."""
-        if df.empty:
-            display(df)
+        if const.headless or df.empty:
+            if not const.headless:
+                display(df)
             return df
         _fmt = self.floatfmt
         if isinstance(df, Series):
@@ -34,6 +34,7 @@ class Paths(BoilercvPipelineContextStore):
     large_example_cine: DataFile = example_cines / "2022-01-06T16-57-31.cine"
 
     # * Local results
+    fits: DataDir = Path("fits")
     media: DataDir = Path("media")
 
     # * DVC-tracked imports
@@ -47,6 +48,7 @@ class Paths(BoilercvPipelineContextStore):
     }
     samples: DataDir = Path("samples")
     sources: DataDir = Path("sources")
+    stats: DataDir = Path("stats")
     thermal: DataDir = Path("thermal")
 
     # * DVC-tracked results
@@ -63,6 +65,7 @@ class Paths(BoilercvPipelineContextStore):
     objects: DataDir = e230920 / Path("objects")
     objects_plots: DataDir = e230920 / Path("objects_plots")
     tracks: DataDir = e230920 / Path("tracks")
+    track_table: DataDir = e230920 / Path("track_table")
     tracks_plots: DataDir = e230920 / Path("tracks_plots")
 
     # ! Previews
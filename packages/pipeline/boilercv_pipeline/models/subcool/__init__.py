@@ -29,6 +29,7 @@ from boilercv_pipeline.sync_dvc.validators import (
     dvc_extend_with_timestamp_suffixed_plots,
     dvc_set_only_sample,
 )
+from boilercv_pipeline.types import StartMethod
 
 
 class Constants(BaseModel):
@@ -139,6 +140,12 @@ class FilledParams(
     """Count of frames."""
     frame_step: int = 1
     """Step between frames."""
+    max_workers: int = 4
+    """Number of worker processes running notebooks. Use all cores if zero."""
+    start_method: StartMethod = "spawn"
+    """Start method for worker processes."""
+    max_tasks_per_child: int = 0
+    """Notebook runs before replacing a worker process. Reuse workers if zero."""
     slicer_patterns: dict[str, Slicers] = Field(default_factory=dict)
     """Slicer patterns."""
     filled: Ann[
@@ -1,31 +1,201 @@
 """Notebook operations."""
 
-from collections.abc import Callable, Iterable
-from concurrent.futures import Future, ProcessPoolExecutor
-from typing import Any
+from __future__ import annotations
 
-from boilercore.notebooks.namespaces import get_nb_ns
+from ast import Import, ImportFrom, parse
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass, field
+from functools import cache
+from hashlib import sha256
+from importlib import import_module
+from importlib.util import MAGIC_NUMBER
+from json import loads
+from marshal import dumps as marshal_dumps
+from marshal import loads as marshal_loads
+from multiprocessing import get_context
+from os import cpu_count, getpid
+from pathlib import Path
+from threading import BoundedSemaphore, Lock
+from types import CodeType, SimpleNamespace
+from typing import Any, Self, TypeAlias
 
+from IPython import __version__ as ipython_version
+from IPython.core.inputtransformer2 import TransformerManager
+from IPython.display import display
+
+from boilercv_pipeline.config import const
 from boilercv_pipeline.models.params import DataParams
+from boilercv_pipeline.models.params import const as params_const
 from boilercv_pipeline.models.params.types import Data_T
 from boilercv_pipeline.models.stage import Deps, Outs
+from boilercv_pipeline.types import StartMethod
+
+NB_CACHE = const.root / ".cache" / "nbs"
+"""Cache of compiled notebooks, at the project root."""
+COMPILER_HASH = sha256(
+    b"".join([Path(__file__).read_bytes(), ipython_version.encode(), MAGIC_NUMBER])
+).hexdigest()[:16]
+"""Hash of the notebook compiler, its IPython transforms, and Python's bytecode."""
+PARAMETERS_TAG = "parameters"
+"""Tag of the cell below which parameters are injected."""
+DFS_TAG = "dfs"
+"""Tag of cells that compute data frames."""
+PLOTS_TAG = "plots"
+"""Tag of cells that only generate plots."""
+CONTOURS_TAG = "contours"
+"""Tag of cells that find objects from contours."""
+COMPONENTS_TAG = "components"
+"""Tag of cells that find objects from connected components."""
+IPYTHON_SHELL_CALL = "get_ipython()"
+"""Call to the IPython shell, which IPython transforms magics and shell commands into."""
 
+CompiledCell: TypeAlias = tuple[CodeType, tuple[str, ...]]
+"""Compiled code of a notebook cell and its tags."""
 
-def apply_to_nb(nb: str, params: DataParams[Deps, Outs, Data_T], **kwds: Any) -> Data_T:
+
+def apply_to_nb(
+    nb: str,
+    params: DataParams[Deps, Outs, Data_T],
+    headless: bool = True,
+    skip_tags: Iterable[str] = (),
+    **kwds: Any,
+) -> Data_T:
     """Apply a process to a notebook."""
-    return get_nb_ns(
-        nb=nb, params={"PARAMS": params.model_dump_json(), **kwds}
+    return exec_nb(
+        nb=nb,
+        params={"PARAMS": params.model_dump_json(), **kwds},
+        headless=headless,
+        skip_tags=skip_tags,
     ).params.data
 
 
+def exec_nb(
+    nb: str,
+    params: Mapping[str, Any] | None = None,
+    headless: bool = False,
+    skip_tags: Iterable[str] = (),
+) -> SimpleNamespace:
+    """Execute a compiled notebook, injecting parameters below its parameters cell.
+
+    Headless runs skip displaying outputs and previewing data frames. Cells with any of
+    the tags to skip aren't executed.
+    """
+    skip_tags = set(skip_tags)
+    namespace: dict[str, Any] = {
+        "__name__": "__main__",
+        "display": (lambda *_args, **_kwds: None) if headless else display,
+    }
+    headless_, params_const.headless = params_const.headless, headless
+    try:
+        for code, tags in compile_nb(nb):
+            if skip_tags.intersection(tags):
+                continue
+            exec(code, namespace)  # noqa: S102
+            if PARAMETERS_TAG in tags:
+                namespace |= params or {}
+    finally:
+        params_const.headless = headless_
+    return SimpleNamespace(**namespace)
+
+
+@cache
+def compile_nb(nb: str) -> list[CompiledCell]:
+    """Compile notebook code cells, caching them on disk by notebook and compiler hash.
+
+    Cells are executed outside of IPython, so cells using magics or shell commands are
+    rejected.
+    """
+    h = sha256(nb.encode("utf-8"))
+    path = NB_CACHE / f"{h.hexdigest()[:16]}-{COMPILER_HASH}.marshal"
+    if path.exists():
+        # ? Only code compiled by this function is cached
+        return marshal_loads(path.read_bytes())  # noqa: S302
+    transformer = TransformerManager()
+    cells = [
+        (
+            compile_cell(
+                transformer, "".join(cell["source"]), filename=f"<notebook cell {i}>"
+            ),
+            tuple(cell["metadata"].get("tags", [])),
+        )
+        for i, cell in enumerate(loads(nb)["cells"])
+        if cell["cell_type"] == "code"
+    ]
+    NB_CACHE.mkdir(parents=True, exist_ok=True)
+    # ? Write atomically, since worker processes may compile the same notebook
+    (tmp := path.with_suffix(f".{getpid()}.tmp")).write_bytes(marshal_dumps(cells))
+    tmp.replace(path)
+    return cells
+
+
+def compile_cell(
+    transformer: TransformerManager, source: str, filename: str
+) -> CodeType:
+    """Compile a notebook cell, rejecting magics and shell commands."""
+    code = transformer.transform_cell(source)
+    # IPython transforms magics and shell commands into calls to its shell
+    if code.count(IPYTHON_SHELL_CALL) > source.count(IPYTHON_SHELL_CALL):
+        raise ValueError(
+            f"Magics and shell commands in {filename} can't be executed outside of"
+            " IPython. Replace them with equivalent Python code."
+        )
+    return compile(code, filename=filename, mode="exec")
+
+
+def get_nb_executor(
+    nb: str,
+    max_workers: int = 0,
+    start_method: StartMethod = "spawn",
+    max_tasks_per_child: int = 0,
+) -> ProcessPoolExecutor:
+    """Get an executor for notebook processes whose workers import notebook deps once.
+
+    Use all cores if `max_workers` is zero, and reuse workers indefinitely if
+    `max_tasks_per_child` is zero. Limiting tasks per child requires a start method
+    other than `fork`.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers or cpu_count(),
+        mp_context=get_context(start_method),
+        initializer=import_nb_deps,
+        initargs=(nb,),
+        max_tasks_per_child=max_tasks_per_child or None,
+    )
+
+
+def import_nb_deps(nb: str):
+    """Import modules that a notebook imports, warming up a worker process."""
+    for cell in loads(nb)["cells"]:
+        if cell["cell_type"] != "code":
+            continue
+        # ? Skip cells that aren't valid Python, e.g. those with magics
+        with suppress(SyntaxError):
+            for node in parse("".join(cell["source"])).body:
+                if isinstance(node, Import):
+                    for alias in node.names:
+                        import_module(alias.name)
+                elif (
+                    isinstance(node, ImportFrom)
+                    and node.module
+                    and not node.level
+                    and node.module != "__future__"
+                ):
+                    import_module(node.module)
+
+
 def submit_nb_process(
     executor: ProcessPoolExecutor,
     nb: str,
     params: DataParams[Deps, Outs, Data_T],
+    skip_tags: Iterable[str] = (),
     **kwds: Any,
 ) -> Future[Data_T]:
     """Submit a notebook process to an executor."""
-    return executor.submit(apply_to_nb, nb=nb, params=params, **kwds)
+    return executor.submit(
+        apply_to_nb, nb=nb, params=params, skip_tags=skip_tags, **kwds
+    )
 
 
 def callbacks(
@@ -34,3 +204,45 @@ def callbacks(
     """Apply a series of done callbacks to the future."""
     for callback in callbacks:
         callback(future)
+
+
+@dataclass
+class Writer:
+    """Write results in background threads, bounding the number of pending writes.
+
+    Submitting blocks while too many writes are pending, applying back-pressure to
+    whatever produces the results, e.g. done callbacks of a notebook process executor.
+    Exceptions raised by writes are raised on exit.
+    """
+
+    max_workers: int = 2
+    """Maximum number of concurrent writes."""
+    max_pending: int = 8
+    """Maximum number of pending writes, including those in progress."""
+    executor: ThreadPoolExecutor = field(init=False)
+    pending: BoundedSemaphore = field(init=False)
+    futures: list[Future[Any]] = field(default_factory=list, init=False)
+    lock: Lock = field(default_factory=Lock, init=False)
+
+    def __post_init__(self):
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="writer"
+        )
+        self.pending = BoundedSemaphore(self.max_pending)
+
+    def submit(self, f: Callable[..., Any], /, *args: Any, **kwds: Any) -> Future[Any]:
+        """Submit a write, blocking while too many writes are pending."""
+        self.pending.acquire()
+        future = self.executor.submit(f, *args, **kwds)
+        future.add_done_callback(lambda _: self.pending.release())
+        with self.lock:
+            self.futures.append(future)
+        return future
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_exc: object):
+        self.executor.shutdown(wait=True)
+        for future in self.futures:
+            future.result()
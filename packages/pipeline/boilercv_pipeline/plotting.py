@@ -1,15 +1,42 @@
 """Plot operations."""
 
+from collections.abc import Sequence
 from pathlib import Path
+from typing import Any
 
 from context_models import CONTEXT
 from matplotlib.axes import Axes
 from matplotlib.cm import ScalarMappable
-from matplotlib.colors import ListedColormap, Normalize
+from matplotlib.collections import QuadMesh
+from matplotlib.colors import ListedColormap, Normalize, to_rgb
+from matplotlib.image import AxesImage
+from numpy import (
+    array,
+    bincount,
+    errstate,
+    floor,
+    full,
+    geomspace,
+    isfinite,
+    linspace,
+    log10,
+    maximum,
+    minimum,
+    nan,
+    where,
+    zeros,
+)
+from numpy.typing import ArrayLike
 from pandas import CategoricalDtype, DataFrame
 from pydantic import BaseModel
 from seaborn import color_palette
 
+from boilercv.data import XPX, YPX
+from boilercv.types import DA, ArrFloat, ArrInt
+
+Extent = tuple[float, float, float, float]
+"""Image extent as left, right, bottom, and top, as in `matplotlib.pyplot.imshow`."""
+
 
 def get_cat_colorbar(
     ax: Axes, col: str, palette: str, data: DataFrame, alpha: float = 1.0
@@ -28,6 +55,95 @@ def get_cat_colorbar(
     return p.colors, data  # pyright: ignore[reportAttributeAccessIssue]
 
 
+def get_extent(img: DA, scale: float = 1.0) -> Extent:
+    """Get the extent of an image from its pixel coordinates, which may be cropped."""
+    y, x = img[YPX].values, img[XPX].values
+    return (x[0] * scale, (x[-1] + 1) * scale, (y[-1] + 1) * scale, y[0] * scale)
+
+
+def rasterize_points(
+    x: ArrayLike,
+    y: ArrayLike,
+    extent: Extent,
+    shape: tuple[int, int],
+    categories: ArrayLike | None = None,
+    log: bool = False,
+) -> tuple[ArrInt, ArrInt]:
+    """Rasterize points into an image of counts and categories per pixel.
+
+    Points are binned into pixels spanning the extent, like `datashader`, so the cost of
+    plotting them doesn't depend on how many there are. Each pixel takes the greatest
+    integer category binned into it, or `-1` if empty. Points on the edges of the extent
+    are kept, and those outside of it are dropped. Bin `y` logarithmically if `log`, for
+    plotting on log-scaled axes, dropping points that aren't positive.
+    """
+    left, right, bottom, top = extent
+    height, width = shape
+    x, y = array(x, dtype=float), array(y, dtype=float)
+    if log:
+        with errstate(divide="ignore", invalid="ignore"):
+            y, bottom, top = log10(y), log10(bottom), log10(top)
+    col = get_bins(x, left, right, width)
+    row = get_bins(y, top, bottom, height)
+    valid = isfinite(col) & isfinite(row)
+    pixels = row[valid].astype(int) * width + col[valid].astype(int)
+    counts = bincount(pixels, minlength=height * width).reshape(shape)
+    cats = full(height * width, -1)
+    if categories is not None:
+        maximum.at(cats, pixels, array(categories)[valid])
+    else:
+        cats[counts.ravel() > 0] = 0
+    return counts, cats.reshape(shape)
+
+
+def get_bins(values: ArrFloat, start: float, stop: float, size: int) -> ArrFloat:
+    """Get bins of values spanning `start` to `stop`, inclusive, or NaN outside them.
+
+    Values at `stop` fall in the last bin. If `start` and `stop` coincide, values there
+    fall in the first bin.
+    """
+    with errstate(divide="ignore", invalid="ignore"):
+        fraction = (
+            (values - start) / (stop - start)
+            if stop != start
+            else where(values == start, 0.0, nan)
+        )
+    bins = minimum(floor(fraction * size), size - 1)
+    return where((fraction >= 0) & (fraction <= 1), bins, nan)
+
+
+def plot_raster(
+    ax: Axes,
+    counts: ArrInt,
+    categories: ArrInt,
+    palette: Sequence[str | tuple[float, float, float]],
+    extent: Extent,
+    alpha: float = 1.0,
+    **kwds: Any,
+) -> AxesImage | QuadMesh:
+    """Plot rasterized points, colored by category and shaded by count.
+
+    Pixels are as opaque as the same number of overlapping markers of a given alpha.
+    Points rasterized with `log` are plotted as a mesh on log-scaled axes.
+    """
+    colors = array([to_rgb(color) for color in palette])
+    image = zeros((*counts.shape, 4))
+    filled = categories >= 0
+    image[filled, :3] = colors[categories[filled] % len(colors)]
+    image[..., 3] = 1 - (1 - alpha) ** counts
+    if ax.get_yscale() == "log":
+        left, right, bottom, top = extent
+        height, width = counts.shape
+        kwds.pop("aspect", None)
+        return ax.pcolormesh(
+            linspace(left, right, width + 1),
+            geomspace(top, bottom, height + 1),
+            image,
+            **kwds,
+        )
+    return ax.imshow(image, extent=extent, interpolation="nearest", **kwds)
+
+
 def save_plots(plots: BaseModel, path: Path, suffix: str = ""):
     """Save a DataFrame to HDF5 format."""
     for name, fig in plots.model_dump().items():
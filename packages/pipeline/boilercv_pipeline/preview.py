@@ -1,76 +1,197 @@
-"""Update previews for various stages."""
+"""Update previews for various stages.
 
-from collections.abc import Iterator
+Previews are stored one frame per video along an unlimited video name dimension, each
+padded into a tile of fixed size. A single video's preview can then be appended,
+replaced, or dropped in place, without rewriting the previews of other videos.
+"""
+
+from collections.abc import Iterator, Mapping
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
-from xarray import combine_by_coords, open_dataset
+from h5netcdf import File
+from numpy import pad
 
 from boilercv.data import VIDEO, VIDEO_NAME, XPX, YPX, assign_ds
 from boilercv.data.models import Dimension
-from boilercv.types import DS
-from boilercv_pipeline.captivate.previews import pad_images
+from boilercv.types import DS, Img
 from boilercv_pipeline.models.paths import paths
+from boilercv_pipeline.sets import get_sources, is_processed, record_processed
 
 
 @contextmanager
 def new_videos_to_preview(
-    destination: Path, reprocess: bool = False, sources: Path = paths.sources
+    destination: Path,
+    reprocess: bool = False,
+    sources: Path = paths.sources,
+    stage: str = "",
 ) -> Iterator[dict[str, Any]]:
-    """Get empty mapping of new videos to preview and write to disk."""
+    """Get empty mapping of new videos to preview and write to disk.
+
+    Videos are new if they're missing from the destination, or if their sources or the
+    stage changed since they were previewed. Previews of videos missing from the sources
+    are dropped.
+    """
+    source_paths = get_sources(sources)
+    existing_names = get_preview_names(destination)
+    new_video_names = [
+        name
+        for name, source in source_paths.items()
+        if reprocess
+        or name not in existing_names
+        or not is_processed(
+            destination,
+            sources=[source],
+            stage=stage,
+            manifest=get_preview_manifest_path(destination, name),
+        )
+    ]
+
     # Yield a mapping of new video names to previews, to be populated by the user
-    names = [source.stem for source in sorted(sources.iterdir())]
-    if reprocess:
-        # Reprocess all names
-        new_video_names = names
-    else:
-        # Get the names missing from the destination
-        existing_names: list[str] = []
-        if destination.exists():
-            with open_dataset(destination) as existing_ds:
-                existing_names.extend(list(existing_ds[VIDEO_NAME].values))
-        new_video_names = [name for name in names if name not in existing_names]
     videos_to_preview = dict.fromkeys(new_video_names)
-
     yield videos_to_preview
 
-    # Keep only valid received previews and build a dataset of new previews
-    if received_previews := {
+    # Keep only valid received previews and write them to the preview store
+    received_previews: dict[str, Img] = {
         video_name: preview
         for video_name, preview in videos_to_preview.items()
         if preview is not None and video_name in new_video_names
-    }:
-        received_video_names = list(received_previews.keys())
-        received_previews = list(received_previews.values())
-        new_ds = get_preview_ds(received_video_names, received_previews)
-
-        if not reprocess and destination.exists():
-            with open_dataset(destination) as existing_ds:
-                if new_ds[VIDEO].shape == existing_ds[VIDEO].shape:
-                    # Combine datasets if they're the same shape
-                    new_ds = combine_by_coords([existing_ds, new_ds])
-                else:
-                    # Otherwise: destructure, pad, and rebuild them together
-                    existing_names = list(existing_ds[VIDEO_NAME].values)
-                    new_ds = get_preview_ds(
-                        existing_names + received_video_names,
-                        received_previews + list(existing_ds.video.values),
-                    )
-
-        new_ds.to_netcdf(path=destination, encoding={VIDEO: {"zlib": True}})
+    }
+    stale_names = [name for name in existing_names if name not in source_paths]
+    if reprocess or not update_previews(destination, received_previews, stale_names):
+        write_previews(destination, received_previews, stale_names, reprocess)
+    for video_name in stale_names:
+        get_preview_manifest_path(destination, video_name).unlink(missing_ok=True)
+    for video_name in received_previews:
+        record_processed(
+            destination,
+            sources=[source_paths[video_name]],
+            stage=stage,
+            manifest=get_preview_manifest_path(destination, video_name),
+        )
+
+
+def get_preview_names(destination: Path) -> list[str]:
+    """Get the names of videos in a preview store."""
+    if not destination.exists():
+        return []
+    with File(destination, "r") as f:
+        return [decode(name) for name in f[VIDEO_NAME][:]]
+
+
+def update_previews(
+    destination: Path, previews: Mapping[str, Img], stale_names: list[str]
+) -> bool:
+    """Append, replace, and drop previews in place.
+
+    Returns whether the previews were updated. They aren't if the store doesn't exist,
+    can't grow, or if some new preview doesn't fit its tiles.
+    """
+    if not destination.exists():
+        return False
+    with File(destination, "a") as f:
+        video, names = f[VIDEO], f[VIDEO_NAME]
+        tile = video.shape[1:]
+        if not f.dimensions[VIDEO_NAME].isunlimited() or any(
+            not fits(preview.shape, tile) for preview in previews.values()
+        ):
+            return False
+        indices = {decode(name): i for i, name in enumerate(names[:])}
+        for name, preview in previews.items():
+            if name not in indices:
+                indices[name] = len(indices)
+                f.resize_dimension(VIDEO_NAME, len(indices))
+                names[indices[name]] = name
+            video[indices[name]] = pad_to(preview, tile).astype(video.dtype)
+        for name in stale_names:
+            # Move the last preview into the dropped slot, then shrink the store
+            i, last = indices.pop(name), len(indices)
+            if i != last:
+                last_name = decode(names[last])
+                video[i], names[i] = video[last], last_name
+                indices[last_name] = i
+            f.resize_dimension(VIDEO_NAME, last)
+    return True
+
+
+def write_previews(
+    destination: Path,
+    previews: Mapping[str, Img],
+    stale_names: list[str],
+    reprocess: bool = False,
+):
+    """Write the preview store, padding all previews into tiles of a common size."""
+    previews = dict(previews)
+    if not reprocess and destination.exists():
+        with File(destination, "r") as f:
+            video, names = f[VIDEO], f[VIDEO_NAME]
+            for i, name in enumerate(decode(name) for name in names[:]):
+                if name not in previews and name not in stale_names:
+                    previews[name] = video[i]
+                    if video.attrs.get("dtype") == "bool":
+                        previews[name] = previews[name].astype(bool)
+    if not previews:
+        return
+    get_preview_ds(list(previews.keys()), list(previews.values())).to_netcdf(
+        path=destination,
+        engine="h5netcdf",
+        unlimited_dims=[VIDEO_NAME],
+        encoding={VIDEO: {"zlib": True}},
+    )
 
 
 def get_preview_ds(preview_names: list[str], previews: list[Any]) -> DS:
     """Get a dataset of preview images, padding sizes as necessary."""
+    tile = tuple(
+        max(sizes) for sizes in zip(*(p.shape[:2] for p in previews), strict=True)
+    )
     return assign_ds(
         name=VIDEO,
         long_name="Video preview",
         units="Pixel state",
-        data=pad_images(previews),
+        data=[pad_to(preview, tile) for preview in previews],
         dims=(
             Dimension(dim=VIDEO_NAME, long_name="Video name", coords=preview_names),
             Dimension(dim=YPX, long_name="Height", units="px"),
             Dimension(dim=XPX, long_name="Width", units="px"),
         ),
     )
+
+
+def pad_to(image: Img, tile: tuple[int, ...]) -> Img:
+    """Pad an image evenly about its center to fill a tile."""
+    hpad, wpad = (
+        size - dim for size, dim in zip(tile[:2], image.shape[:2], strict=True)
+    )
+    # If a pad is odd, add an extra to the bottom/right of the pad
+    return pad(
+        image,
+        (
+            (hpad // 2, hpad - hpad // 2),
+            (wpad // 2, wpad - wpad // 2),
+            *((0, 0),) * (image.ndim - 2),
+        ),
+    )
+
+
+def fits(shape: tuple[int, ...], tile: tuple[int, ...]) -> bool:
+    """Check whether an image of a certain shape fits a tile."""
+    return len(shape) == len(tile) and all(
+        dim <= size for dim, size in zip(shape, tile, strict=True)
+    )
+
+
+def get_preview_manifest_path(destination: Path, name: str) -> Path:
+    """Get the path to the manifest of a single video's preview."""
+    manifests = (
+        destination.parent.with_name(f"manifest_{destination.parent.name}")
+        / destination.stem
+    )
+    manifests.mkdir(parents=True, exist_ok=True)
+    return manifests / f"{name}.json"
+
+
+def decode(name: str | bytes) -> str:
+    """Decode a video name read from a preview store."""
+    return name.decode("utf-8") if isinstance(name, bytes) else name
@@ -6,7 +6,7 @@ from xarray import Dataset, apply_ufunc, open_dataset
 
 from boilercv.colors import RED
 from boilercv.data import VIDEO, YX_PX, identity_da
-from boilercv.images import draw_text, overlay
+from boilercv.images import draw_texts, overlay_all
 from boilercv.types import DA, DS
 from boilercv_pipeline import DEBUG
 from boilercv_pipeline.sets import slice_frames
@@ -27,25 +27,14 @@ def get_preview(path: Path) -> DS:
 def draw_text_da(da: DA) -> DA:
     """Draw text on images in a data array."""
     frames_dim = str(da.dims[0])
-    if da.ndim == 4:
-        # We have a color video
-        return apply_ufunc(
-            draw_text,
-            da,
-            identity_da(da, frames_dim),
-            input_core_dims=([*YX_PX, "channel"], []),
-            output_core_dims=([*YX_PX, "channel"],),
-            vectorize=True,
-        )
-    else:
-        return apply_ufunc(
-            draw_text,
-            da,
-            identity_da(da, frames_dim),
-            input_core_dims=(YX_PX, []),
-            output_core_dims=(YX_PX,),
-            vectorize=True,
-        )
+    core_dims = [frames_dim, *YX_PX, *(["channel"] if da.ndim == 4 else [])]
+    return apply_ufunc(
+        draw_texts,
+        da,
+        identity_da(da, frames_dim),
+        input_core_dims=(core_dims, [frames_dim]),
+        output_core_dims=(core_dims,),
+    )
 
 
 def compose_da(da_image: DA, da_overlay: DA, color: tuple[int, int, int] = RED) -> DA:
@@ -57,11 +46,10 @@ def compose_da(da_image: DA, da_overlay: DA, color: tuple[int, int, int] = RED)
         color: Color for the overlay.
     """
     return apply_ufunc(
-        overlay,
+        overlay_all,
         da_image,
         da_overlay,
         input_core_dims=(YX_PX, YX_PX),
         output_core_dims=([*YX_PX, "channel"],),
-        vectorize=True,
         kwargs=dict(color=color),
     )
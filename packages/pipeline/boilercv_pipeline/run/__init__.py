@@ -0,0 +1,28 @@
+"""Run pipeline stages, streaming videos through per-video stages."""
+
+from cappa.base import command
+from pydantic import BaseModel, Field
+
+
+class Constants(BaseModel):
+    """Constants."""
+
+    process_video: str = "process_video"
+    """Name of the function processing a single video in per-video stage modules."""
+    video_source: str = "VIDEO_SOURCE"
+    """Name of the variable naming the dependency holding videos in per-video stages."""
+
+
+const = Constants()
+
+
+@command(default_long=True, invoke="boilercv_pipeline.run.__main__.main")
+class Run(BaseModel):
+    """Run pipeline stages, streaming videos through per-video stages."""
+
+    stages: str = "boilercv_pipeline.stages"
+    """Dotted module path to the package containing stages."""
+    only: list[str] = Field(default_factory=list)
+    """Only run these stages, or all stages if empty."""
+    max_workers: int = 0
+    """Maximum number of worker processes, or the number of CPUs if zero."""
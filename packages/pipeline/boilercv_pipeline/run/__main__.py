@@ -0,0 +1,212 @@
+"""Run pipeline stages, streaming videos through per-video stages."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from graphlib import TopologicalSorter
+from importlib import import_module
+from os import cpu_count
+from pathlib import Path
+from types import ModuleType
+from typing import TypeAlias
+
+from cappa.base import invoke
+from loguru import logger
+
+from boilercv_pipeline.models.params import Params
+from boilercv_pipeline.models.stage import Deps, Outs, Stage, StagePaths
+from boilercv_pipeline.run import Run, const
+from boilercv_pipeline.sync_dvc.__main__ import get_stage_models
+
+Task: TypeAlias = tuple[str, str | None]
+"""A stage and the video it processes, or `None` for the whole stage."""
+
+
+def main(params: Run):
+    """Run pipeline stages, streaming videos through per-video stages."""
+    stages = get_stages(params.stages, params.only)
+    max_workers = params.max_workers or cpu_count()
+    logger.info(f"Start running {len(stages)} stages with {max_workers} workers")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        Scheduler(stages).run(executor)
+    logger.info("Finish running stages")
+
+
+@dataclass
+class ScheduledStage:
+    """Pipeline stage scheduled for running."""
+
+    name: str
+    """Stage name."""
+    params: Params[Deps, Outs]
+    """Stage parameters."""
+    per_video: bool
+    """Whether this stage processes one video at a time."""
+    video_source: str | None = None
+    """Name of the dependency holding videos to process, for per-video stages."""
+    upstream: set[str] = field(default_factory=set)
+    """Names of stages producing dependencies of this stage."""
+
+    @property
+    def deps(self) -> list[Path]:
+        """Stage dependency paths."""
+        return get_paths(self.params.deps)
+
+    @property
+    def outs(self) -> list[Path]:
+        """Stage output paths."""
+        return get_paths(self.params.outs)
+
+    def get_videos(self) -> list[str]:
+        """Get names of videos in the video source of this stage."""
+        if not self.video_source:
+            raise ValueError(
+                f"Per-video stage '{self.name}' doesn't name its video source."
+            )
+        source = Path(getattr(self.params.deps, self.video_source))
+        return sorted(p.stem for p in source.iterdir()) if source.is_dir() else []
+
+
+def get_stages(stages: str, only: Iterable[str] = ()) -> dict[str, ScheduledStage]:
+    """Get stages and the stages upstream of them, from their deps and outs."""
+    only = set(only)
+    return sort_stages({
+        name: ScheduledStage(
+            name=name,
+            params=model(),
+            per_video=hasattr(get_main(model), const.process_video),
+            video_source=getattr(get_main(model), const.video_source, None),
+        )
+        for name, model in get_stage_models(stages).items()
+        if not only or name in only
+    })
+
+
+def sort_stages(scheduled: dict[str, ScheduledStage]) -> dict[str, ScheduledStage]:
+    """Find stages upstream of each stage, and sort stages topologically."""
+    for stage in scheduled.values():
+        stage.upstream = {
+            other.name
+            for other in scheduled.values()
+            if other is not stage
+            and any(overlaps(dep, out) for dep in stage.deps for out in other.outs)
+        }
+    return {
+        name: scheduled[name]
+        for name in TopologicalSorter({
+            name: stage.upstream for name, stage in scheduled.items()
+        }).static_order()
+    }
+
+
+@dataclass
+class Scheduler:
+    """Schedule stages so that videos stream through consecutive per-video stages.
+
+    Whole stages run once all stages upstream of them have finished. Per-video stages
+    process each video as soon as that video has passed through all per-video stages
+    upstream, so one video may be in a later stage while another is in an earlier one.
+    """
+
+    stages: dict[str, ScheduledStage]
+    """Stages in topological order."""
+    videos: dict[str, list[str]] = field(default_factory=dict)
+    """Videos to be processed by each expanded per-video stage."""
+    done: set[Task] = field(default_factory=set)
+    """Finished tasks."""
+    submitted: set[Task] = field(default_factory=set)
+    """Submitted tasks."""
+
+    def run(self, executor: ProcessPoolExecutor):
+        """Run all stages."""
+        running: dict[Future[None], Task] = {}
+        while True:
+            for task in self.get_ready():
+                self.submitted.add(task)
+                stage, video = task
+                logger.info(f"Submit {stage}" + (f" for {video}" if video else ""))
+                running[
+                    executor.submit(run_stage, self.stages[stage].params, video)
+                ] = task
+            if not running:
+                return
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                future.result()
+                self.done.add(running.pop(future))
+
+    def get_ready(self) -> list[Task]:
+        """Get tasks that are ready to be submitted."""
+        ready: list[Task] = []
+        for name, stage in self.stages.items():
+            per_video_upstream = [
+                up for up in stage.upstream if self.stages[up].per_video
+            ]
+            whole_upstream = set(stage.upstream) - set(per_video_upstream)
+            if not all(self.is_complete(up) for up in whole_upstream):
+                continue
+            if not stage.per_video:
+                if (name, None) not in self.submitted and all(
+                    self.is_complete(up) for up in per_video_upstream
+                ):
+                    ready.append((name, None))
+                continue
+            if name not in self.videos:
+                if per_video_upstream and any(
+                    up not in self.videos for up in per_video_upstream
+                ):
+                    continue
+                self.videos[name] = (
+                    self.videos[per_video_upstream[0]]
+                    if per_video_upstream
+                    else stage.get_videos()
+                )
+            ready.extend(
+                (name, video)
+                for video in self.videos[name]
+                if (name, video) not in self.submitted
+                and all((up, video) in self.done for up in per_video_upstream)
+            )
+        return ready
+
+    def is_complete(self, name: str) -> bool:
+        """Whether a stage has finished processing."""
+        if not self.stages[name].per_video:
+            return (name, None) in self.done
+        return name in self.videos and all(
+            (name, video) in self.done for video in self.videos[name]
+        )
+
+
+def run_stage(params: Params[Deps, Outs], video: str | None = None):
+    """Run a whole stage, or a per-video stage on a single video."""
+    main = get_main(type(params))
+    if video is None:
+        main.main(params)
+        return
+    getattr(main, const.process_video)(params, video)
+
+
+def get_main(model: type[Stage]) -> ModuleType:
+    """Get the main module of a stage."""
+    return import_module(f"{model.__module__}.__main__")
+
+
+def get_paths(paths: StagePaths) -> list[Path]:
+    """Get data paths from stage deps or outs, excluding the stage module itself."""
+    return [
+        Path(path).resolve()
+        for name, path in dict(paths).items()
+        if name != "stage" and isinstance(path, Path)
+    ]
+
+
+def overlaps(path: Path, other: Path) -> bool:
+    """Whether one path is equal to or contains the other."""
+    return path.is_relative_to(other) or other.is_relative_to(path)
+
+
+if __name__ == "__main__":
+    invoke(Run)
@@ -1,13 +1,18 @@
 """Datasets."""
 
-from collections.abc import Iterator, Mapping
+from ast import Import, ImportFrom, parse, walk
+from collections.abc import Iterable, Iterator, Mapping
 from contextlib import contextmanager, nullcontext
+from functools import cache
+from hashlib import sha256
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Any
 
 from more_itertools import first, last
-from numpy import iinfo, integer, isin, issubdtype, unique
+from numpy import bitwise_and, bitwise_or, iinfo, integer, isin, issubdtype, unique
 from pandas import read_hdf
+from pydantic import BaseModel, Field
 from xarray import Dataset, open_dataset
 
 from boilercv.correlations.types import Stage
@@ -17,6 +22,7 @@ from boilercv.types import DA, DF, DS
 from boilercv_pipeline.models.contexts import ROOTED
 from boilercv_pipeline.models.path import get_boilercv_pipeline_context
 from boilercv_pipeline.models.paths import Paths
+from boilercv_pipeline.types import Codec
 
 # TODO: Replace all uses of `ROOTED_PATHS` to eliminate side-effects like `data` folder
 # ..... being created in `docs/notebooks` on docs build
@@ -27,17 +33,70 @@ ALL_FRAMES = slice(None)
 """Slice that gets all frames."""
 STAGE_DEFAULT = "sources"
 """Default stage to work on."""
+HASH_CHUNK_SIZE = 2**20
+"""Size of chunks read when hashing file contents."""
+FIRST_PARTY = ("boilercv", "boilercv_pipeline")
+"""Packages whose modules are hashed along with the stages importing them."""
+
+
+class Layout(BaseModel):
+    """Layout of videos on disk, chunked along frames for reading ranges of frames.
+
+    Chunks span whole frames, so reading a range of frames decompresses only the chunks
+    overlapping that range, rather than chunks spanning many more frames.
+    """
+
+    chunk_frames: int = 32
+    """Number of frames in each chunk."""
+    codec: Codec = "zlib"
+    """Compression codec."""
+    complevel: int = 4
+    """Compression level, from fastest at 1 to smallest at 9."""
+    shuffle: bool = True
+    """Whether to shuffle bytes before compressing."""
+
+
+LAYOUTS: dict[Stage, Layout] = {
+    # Grayscale frames are large and compress poorly, so chunk fewer and don't compress
+    "large_sources": Layout(chunk_frames=4, codec="none"),
+    "sources": Layout(),
+    "filled": Layout(),
+}
+"""Layouts of videos on disk by stage."""
+UNCOMPRESSED = Layout(codec="none")
+"""Layout of uncompressed copies of videos, which are read repeatedly."""
+
+
+def get_encoding(video: DA, layout: Layout) -> dict[str, Any]:
+    """Get the encoding to write a video with a certain layout."""
+    chunksizes = tuple(
+        max(min(size, layout.chunk_frames) if dim == FRAME else size, 1)
+        for dim, size in video.sizes.items()
+    )
+    if layout.codec == "none":
+        return {"chunksizes": chunksizes, "zlib": False}
+    return {
+        "chunksizes": chunksizes,
+        "zlib": True,
+        "complevel": layout.complevel,
+        "shuffle": layout.shuffle,
+    }
 
 
 @contextmanager
 def process_datasets(
-    destination_dir: Path, reprocess: bool = False, sources: Path = ROOTED_PATHS.sources
+    destination_dir: Path,
+    reprocess: bool = False,
+    sources: Path = ROOTED_PATHS.sources,
+    stage: str = "",
+    layout: Layout = LAYOUTS["sources"],
 ) -> Iterator[dict[str, Any]]:
     """Get unprocessed dataset names and write them to disk.
 
     Use as a context manager. Given a destination directory, yield a mapping with
     unprocessed dataset names as its keys. Upon exiting the context, datasets assigned
-    to the values of the mapping will be written to disk in the destination directory.
+    to the values of the mapping will be written to disk in the destination directory,
+    and recorded in the manifest of the destination directory.
 
     If no values are assigned to the yielded mapping, no datasets will be written. This
     is useful for processes which take input datasets but handle their own output,
@@ -46,18 +105,25 @@ def process_datasets(
     Args:
         destination_dir: The directory to write datasets to.
         reprocess: Whether to reprocess all datasets.
+        sources: Directory of sources to be processed.
+        stage: Hash of the stage parameters and code, from {func}`get_stage_hash`.
+        layout: Layout of videos written to disk.
     """
     unprocessed_destinations = get_unprocessed_destinations(
-        destination_dir, sources=sources, reprocess=reprocess
+        destination_dir, sources=sources, reprocess=reprocess, stage=stage
     )
     datasets_to_process = dict.fromkeys(unprocessed_destinations)
     yield datasets_to_process
+    source_paths = get_sources(sources)
     for name, ds in datasets_to_process.items():
         if ds is None:
             continue
+        destination = unprocessed_destinations[name]
         ds.to_netcdf(
-            path=unprocessed_destinations[name], encoding={VIDEO: {"zlib": True}}
+            path=destination, encoding={VIDEO: get_encoding(ds[VIDEO], layout)}
         )
+        clear_uncompressed(destination)
+        record_processed(destination, sources=[source_paths[name]], stage=stage)
 
 
 def get_unprocessed_destinations(
@@ -65,12 +131,14 @@ def get_unprocessed_destinations(
     ext: str = "nc",
     reprocess: bool = False,
     sources: Path = ROOTED_PATHS.sources,
+    stage: str = "",
 ) -> dict[str, Path]:
     """Get destination paths for unprocessed datasets.
 
     Given a destination directory, yield a mapping of unprocessed dataset names to
     destinations with a given file extension. A dataset is considered unprocessed if a
-    file sharing its name is not found in the destination directory.
+    file sharing its name is not found in the destination directory, or if its source
+    or the stage changed since it was recorded as processed. See {func}`is_processed`.
 
     Parameters
     ----------
@@ -84,6 +152,8 @@ def get_unprocessed_destinations(
         Reprocess all datasets.
     sources
         Directory of sources to be processed.
+    stage
+        Hash of the stage parameters and code, from {func}`get_stage_hash`.
 
     Returns
     -------
@@ -91,13 +161,199 @@ def get_unprocessed_destinations(
     """
     unprocessed_destinations: dict[str, Path] = {}
     ext = ext.lstrip(".")
-    for name in [source.stem for source in sorted(sources.iterdir())]:
+    for name, source in get_sources(sources).items():
         destination = destination_dir / f"{name}.{ext}"
-        if reprocess or not destination.exists():
+        if reprocess or not is_processed(destination, sources=[source], stage=stage):
             unprocessed_destinations[name] = destination
     return unprocessed_destinations
 
 
+def get_sources(sources: Path) -> dict[str, Path]:
+    """Get source paths by dataset name."""
+    return {source.stem: source for source in sorted(sources.iterdir())}
+
+
+# * MARK: Manifests
+
+
+class FileHash(BaseModel):
+    """Hash of a file, along with the size and modification time it was hashed at."""
+
+    size: int = 0
+    """File size in bytes."""
+    mtime_ns: int = 0
+    """File modification time in nanoseconds."""
+    sha256: str = ""
+    """Hash of the file contents."""
+
+
+class Manifest(BaseModel):
+    """Record of the sources and stage that a destination was produced from."""
+
+    stage: str = ""
+    """Hash of the stage parameters and code."""
+    sources: list[FileHash] = Field(default_factory=list)
+    """Hashes of the sources."""
+
+
+def is_processed(
+    destination: Path,
+    sources: Iterable[Path],
+    stage: str = "",
+    manifest: Path | None = None,
+) -> bool:
+    """Check whether a destination is up to date with its sources and stage.
+
+    A destination is out of date if it doesn't exist, if it has no manifest, or if it
+    was recorded as processed from different source contents or a different stage.
+    Source contents are only rehashed if their size or modification time changed.
+    """
+    if not destination.exists():
+        return False
+    manifest_path = manifest or get_manifest_path(destination)
+    if not manifest_path.exists():
+        return False
+    recorded = Manifest.model_validate_json(manifest_path.read_text(encoding="utf-8"))
+    if recorded.stage != stage:
+        return False
+    sources = list(sources)
+    if len(sources) != len(recorded.sources):
+        return False
+    hashes = [
+        hash_file(source, previous)
+        for source, previous in zip(sources, recorded.sources, strict=True)
+    ]
+    if any(
+        h.sha256 != prev.sha256
+        for h, prev in zip(hashes, recorded.sources, strict=True)
+    ):
+        return False
+    if hashes != recorded.sources:
+        write_manifest(manifest_path, Manifest(stage=stage, sources=hashes))
+    return True
+
+
+def record_processed(
+    destination: Path,
+    sources: Iterable[Path],
+    stage: str = "",
+    manifest: Path | None = None,
+):
+    """Record a destination as processed from its sources by a stage."""
+    write_manifest(
+        manifest or get_manifest_path(destination),
+        Manifest(stage=stage, sources=[hash_file(source) for source in sources]),
+    )
+
+
+def clear_uncompressed(destination: Path):
+    """Clear the uncompressed copy of a destination, e.g. after reprocessing it."""
+    (
+        destination.parent.with_name(f"uncompressed_{destination.parent.name}")
+        / destination.name
+    ).unlink(missing_ok=True)
+
+
+def get_manifest_path(destination: Path) -> Path:
+    """Get the path to the manifest of a destination."""
+    manifests = destination.parent.with_name(f"manifest_{destination.parent.name}")
+    manifests.mkdir(parents=True, exist_ok=True)
+    return manifests / f"{destination.name}.json"
+
+
+def write_manifest(path: Path, manifest: Manifest):
+    """Write a manifest."""
+    path.write_text(encoding="utf-8", data=manifest.model_dump_json(indent=2))
+
+
+def hash_file(path: Path, previous: FileHash | None = None) -> FileHash:
+    """Hash a file, reusing the previous hash if its size and mtime match."""
+    stat = path.stat()
+    if (
+        previous
+        and previous.size == stat.st_size
+        and previous.mtime_ns == stat.st_mtime_ns
+    ):
+        return previous
+    h = sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            h.update(chunk)
+    return FileHash(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=h.hexdigest())
+
+
+def get_stage_hash(params: BaseModel) -> str:
+    """Hash stage parameters, other than its paths, along with the stage code.
+
+    Stage code includes the stage package and first-party modules imported by it.
+    """
+    h = sha256(params.model_dump_json(exclude={"deps", "outs", "data"}).encode("utf-8"))
+    h.update(hash_code(type(params).__module__).encode("utf-8"))
+    return h.hexdigest()
+
+
+@cache
+def hash_code(package: str) -> str:
+    """Hash the code of a stage package and the first-party modules it imports."""
+    h = sha256()
+    for name, path in sorted(
+        get_imported_modules([package, f"{package}.__main__"]).items()
+    ):
+        h.update(name.encode("utf-8"))
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def get_imported_modules(
+    modules: Iterable[str], first_party: Iterable[str] = FIRST_PARTY
+) -> dict[str, Path]:
+    """Get source files of modules and first-party modules they import, transitively.
+
+    Imports are found by parsing source files, without importing modules other than
+    the packages containing them.
+    """
+    first_party = set(first_party)
+    sources: dict[str, Path] = {}
+    pending = list(modules)
+    seen: set[str] = set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        try:
+            spec = find_spec(name)
+        except ImportError:
+            continue
+        if not spec or not spec.origin or not spec.origin.endswith(".py"):
+            continue
+        path = sources[name] = Path(spec.origin)
+        package = name if path.name == "__init__.py" else name.rpartition(".")[0]
+        # Importing a module runs the packages containing it
+        if parent := name.rpartition(".")[0]:
+            pending.append(parent)
+        for node in walk(parse(path.read_bytes())):
+            if isinstance(node, Import):
+                imported = [alias.name for alias in node.names]
+            elif isinstance(node, ImportFrom):
+                base = ".".join(
+                    part
+                    for part in [
+                        package.rsplit(".", node.level - 1)[0] if node.level else "",
+                        node.module or "",
+                    ]
+                    if part
+                )
+                # Names imported from packages may be submodules
+                imported = [base, *(f"{base}.{alias.name}" for alias in node.names)]
+            else:
+                continue
+            pending.extend(
+                module for module in imported if module.partition(".")[0] in first_party
+            )
+    return sources
+
+
 def inspect_dataset(
     name: str, stage: Stage = STAGE_DEFAULT, sources: Path = ROOTED_PATHS.sources
 ) -> DS:
@@ -139,7 +395,7 @@ def get_dataset(
     ):
         if not unc_source.exists():
             Dataset({VIDEO: ds[VIDEO]}).to_netcdf(
-                path=unc_source, encoding={VIDEO: {"zlib": False}}
+                path=unc_source, encoding={VIDEO: get_encoding(ds[VIDEO], UNCOMPRESSED)}
             )
         video = ds[VIDEO].sel(frame=frame)
         return Dataset({
@@ -148,6 +404,18 @@ def get_dataset(
         })
 
 
+def load_stats(name: str, stats: Path = ROOTED_PATHS.stats) -> DS | None:
+    """Load statistics of a video computed on conversion, if they exist.
+
+    See `boilercv.data.reductions.get_stats`.
+    """
+    source = stats / f"{name}.nc"
+    if not source.exists():
+        return None
+    with open_dataset(source) as ds:
+        return ds.load()
+
+
 def get_selector(
     video: DA, dim: str, sel: slice | range | Any | None
 ) -> slice | range | Any:
@@ -172,7 +440,8 @@ def inspect_video(path: Path) -> Iterator[DA]:
     with open_dataset(source) as src:
         if not unc_source.exists():
             Dataset({VIDEO: src[VIDEO]}).to_netcdf(
-                path=unc_source, encoding={VIDEO: {"zlib": False}}
+                path=unc_source,
+                encoding={VIDEO: get_encoding(src[VIDEO], UNCOMPRESSED)},
             )
         yield src[VIDEO]
 
@@ -196,7 +465,35 @@ def load_video(
         yield video.sel({XPX: get_selector(video, XPX, slices.get(XPX))})
 
 
-def save_video(da: DA, path: Path):
+def load_composite(
+    path: Path,
+    slices: Mapping[str, slice | range | Any] | None = None,
+    dark: bool = False,
+) -> DA:
+    """Load the composite of video frames, set wherever any frame is set.
+
+    Packed videos are composed by reducing their packed bits, then unpacking only the
+    composite, rather than unpacking every frame. Compose dark objects instead, such as
+    in binarized videos, by setting the composite wherever any frame is unset.
+    """
+    slices = slices or {}
+    with inspect_video(path) as video:
+        video = video.sel({
+            FRAME: get_selector(video, FRAME, slices.get(FRAME)),
+            YPX: get_selector(video, YPX, slices.get(YPX)),
+        })
+        if XPX_PACKED in video.dims:
+            packed = video.reduce(
+                bitwise_and.reduce if dark else bitwise_or.reduce, dim=FRAME
+            )
+            packed = (~packed if dark else packed).expand_dims(FRAME)
+            composite = unpack(packed).isel({FRAME: 0})
+        else:
+            composite = ~video.all(FRAME) if dark else video.any(FRAME)
+    return composite.sel({XPX: get_selector(composite, XPX, slices.get(XPX))})
+
+
+def save_video(da: DA, path: Path, layout: Layout = LAYOUTS["sources"]):
     """Save video data array."""
     cmp_dest, unc_source = get_stage(path.stem, path.parent)
     if issubdtype(da.dtype, integer):
@@ -207,7 +504,9 @@ def save_video(da: DA, path: Path):
             and isin(uniq, [i.min, i.max]).all()
         ):
             da = pack(da)
-    Dataset({VIDEO: da}).to_netcdf(path=cmp_dest, encoding={VIDEO: {"zlib": True}})
+    Dataset({VIDEO: da}).to_netcdf(
+        path=cmp_dest, encoding={VIDEO: get_encoding(da, layout)}
+    )
     if unc_source.exists():
         unc_source.unlink()
 
@@ -2,37 +2,76 @@ from loguru import logger
 from tqdm import tqdm
 from xarray import open_dataset
 
-from boilercv.data import FRAME, ROI, VIDEO, apply_to_img_da
-from boilercv.data.packing import pack
-from boilercv.images import cv, scale_bool
-from boilercv.images.cv import apply_mask, close_and_erode, flood
+from boilercv.data import ROI, VIDEO, XPX, YPX, apply_to_img_da
+from boilercv.data.packing import BITS, pack
+from boilercv.data.reductions import MAX, max_frames
+from boilercv.images import scale_bool
+from boilercv.images.cv import BLOCK_SIZE, binarize_video, close_and_erode, flood
 from boilercv.types import DA
+from boilercv_pipeline.images import get_bounding_slices
 from boilercv_pipeline.parser import invoke
+from boilercv_pipeline.sets import (
+    LAYOUTS,
+    clear_uncompressed,
+    get_encoding,
+    get_stage_hash,
+    is_processed,
+    load_stats,
+    record_processed,
+)
 from boilercv_pipeline.stages.binarize import Binarize as Params
 
+VIDEO_SOURCE = "large_sources"
+"""Dependency holding videos to process."""
+
 
 def main(params: Params):
     logger.info("start binarize")
     for source in tqdm(sorted(params.deps.large_sources.iterdir())):
-        destination = params.outs.sources / source.name
-        if destination.exists():
-            continue
-        with open_dataset(source) as ds:
-            video = ds[VIDEO]
-            maximum = video.max(FRAME)
-            flooded: DA = apply_to_img_da(flood, maximum)
-            roi: DA = apply_to_img_da(close_and_erode, scale_bool(flooded))
-            masked: DA = apply_to_img_da(
-                apply_mask, video, scale_bool(roi), vectorize=True
-            )
-            binarized: DA = apply_to_img_da(cv.binarize, masked, vectorize=True)
-            ds[VIDEO] = pack(binarized)
-            ds.to_netcdf(path=destination, encoding={VIDEO: {"zlib": True}})
-            ds[ROI] = roi
-            ds = ds.drop_vars(VIDEO)
-            ds.to_netcdf(path=params.outs.rois / source.name)
+        process_video(params, source.stem)
     logger.info("finish binarize")
 
 
+def process_video(params: Params, name: str):
+    source = params.deps.large_sources / f"{name}.nc"
+    destination = params.outs.sources / source.name
+    stage = get_stage_hash(params)
+    if is_processed(destination, sources=[source], stage=stage):
+        return
+    stats = load_stats(name, params.deps.stats)
+    with open_dataset(source) as ds:
+        # Get the maximum computed on conversion, or stream it from disk rather than
+        # loading the whole video
+        maximum = stats[MAX] if stats is not None else max_frames(ds[VIDEO])
+        flooded: DA = apply_to_img_da(flood, maximum)
+        roi: DA = apply_to_img_da(close_and_erode, scale_bool(flooded))
+        # Process only the region bounding the ROI, keeping pixel coordinates of the
+        # frame. Pad it so that thresholds near its edges match those of the frame, and
+        # round its columns out to whole bytes so that unpacking restores its width.
+        crop = dict(
+            zip(
+                (YPX, XPX),
+                get_bounding_slices(
+                    roi.values, pad_width=BLOCK_SIZE // 2, col_multiple=BITS
+                ),
+                strict=True,
+            )
+        )
+        ds, roi = ds.isel(crop), roi.isel(crop)
+        video = ds[VIDEO]
+        # Same as `apply_mask` for binary masks, broadcast over all frames
+        masked: DA = video | scale_bool(~roi)
+        ds[VIDEO] = pack(masked, binarize_video)
+        ds.to_netcdf(
+            path=destination,
+            encoding={VIDEO: get_encoding(ds[VIDEO], LAYOUTS["sources"])},
+        )
+        ds[ROI] = roi
+        ds = ds.drop_vars(VIDEO)
+        ds.to_netcdf(path=params.outs.rois / source.name)
+    clear_uncompressed(destination)
+    record_processed(destination, sources=[source], stage=stage)
+
+
 if __name__ == "__main__":
     invoke(Params)
@@ -19,6 +19,7 @@ class Deps(stage.Deps):
 class Outs(stage.Outs):
     large_sources: DataDir = paths.large_sources
     headers: DataDir = paths.headers
+    stats: DataDir = paths.stats
 
 
 @command(default_long=True, invoke="boilercv_pipeline.stages.convert.__main__.main")
@@ -6,9 +6,13 @@ from re import match
 from loguru import logger
 from tomlkit import dumps
 from tqdm import tqdm
+from xarray import open_dataset
 
+from boilercv.data import VIDEO
+from boilercv.data.reductions import get_stats
 from boilercv_pipeline.images import prepare_dataset
 from boilercv_pipeline.parser import invoke
+from boilercv_pipeline.sets import LAYOUTS, get_encoding
 from boilercv_pipeline.stages.convert import Convert as Params
 
 
@@ -20,14 +24,23 @@ def main(params: Params):
         else:
             destination_stem = source.stem
         destination = params.outs.large_sources / f"{destination_stem}.nc"
+        stats = params.outs.stats / destination.name
         if destination.exists():
+            # Videos converted before statistics were computed get them streamed
+            if not stats.exists():
+                with open_dataset(destination) as ds:
+                    get_stats(ds[VIDEO]).to_netcdf(path=stats)
             continue
         matched_crop = None
         for pattern, crop in {}.items():  # TODO: Reimplement crop property
             if match(pattern, source.stem):
                 matched_crop = crop
         header, dataset = prepare_dataset(source, crop=matched_crop)
-        dataset.to_netcdf(path=destination)
+        dataset.to_netcdf(
+            path=destination,
+            encoding={VIDEO: get_encoding(dataset[VIDEO], LAYOUTS["large_sources"])},
+        )
+        get_stats(dataset[VIDEO]).to_netcdf(path=stats)
         Path(params.outs.headers / source.name).write_text(
             encoding="utf-8", data=dumps(header.model_dump(mode="json"))
         )
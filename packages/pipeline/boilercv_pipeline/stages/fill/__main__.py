@@ -7,39 +7,61 @@ from boilercv.data.packing import pack
 from boilercv.images import scale_bool
 from boilercv.images.cv import draw_contours
 from boilercv.types import ArrInt
+from boilercv_pipeline.images import get_offsets
 from boilercv_pipeline.parser import invoke
-from boilercv_pipeline.sets import get_contours_df, get_dataset, process_datasets
+from boilercv_pipeline.sets import (
+    LAYOUTS,
+    clear_uncompressed,
+    get_contours_df,
+    get_dataset,
+    get_encoding,
+    get_stage_hash,
+    is_processed,
+    record_processed,
+)
 from boilercv_pipeline.stages.fill import Fill
 
+VIDEO_SOURCE = "sources"
+"""Dependency holding videos to process."""
+
 
 def main(params: Fill):
     logger.info("Start filling contours")
-    destination = params.outs.filled
-    with process_datasets(
-        destination, sources=params.deps.sources
-    ) as videos_to_process:
-        for name in tqdm(videos_to_process):
-            df = get_contours_df(name, contours=params.deps.contours)
-            source_ds = get_dataset(
-                name, sources=params.deps.sources, rois=params.deps.rois
-            )
-            ds = zeros_like(source_ds, dtype=source_ds[VIDEO].dtype)
-            video = ds[VIDEO]
-            if not df.empty:
-                for frame_num, frame in enumerate(video):
-                    contours: list[ArrInt] = list(  # pyright: ignore[reportAssignmentType]
-                        df.loc[frame_num, :]
-                        .groupby("contour")
-                        .apply(lambda grp: grp.values)
-                    )
-                    video[frame_num, :, :] = draw_contours(
-                        scale_bool(frame.values), contours
-                    )
-            ds[VIDEO] = pack(video)
-            ds = ds.drop_vars(ROI)
-            videos_to_process[name] = ds
+    for source in tqdm(sorted(params.deps.sources.iterdir())):
+        process_video(params, source.stem)
     logger.info("Finish filling contours")
 
 
+def process_video(params: Fill, name: str):
+    destination = params.outs.filled / f"{name}.nc"
+    sources = [
+        params.deps.sources / f"{name}.nc",
+        params.deps.rois / f"{name}.nc",
+        params.deps.contours / f"{name}.h5",
+    ]
+    stage = get_stage_hash(params)
+    if is_processed(destination, sources=sources, stage=stage):
+        return
+    df = get_contours_df(name, contours=params.deps.contours)
+    source_ds = get_dataset(name, sources=params.deps.sources, rois=params.deps.rois)
+    ds = zeros_like(source_ds, dtype=source_ds[VIDEO].dtype)
+    video = ds[VIDEO]
+    # Videos may be cropped, so offset contours to pixel coordinates in the video
+    df -= get_offsets(video)
+    if not df.empty:
+        for frame_num, frame in enumerate(video):
+            contours: list[ArrInt] = list(  # pyright: ignore[reportAssignmentType]
+                df.loc[frame_num, :].groupby("contour").apply(lambda grp: grp.values)
+            )
+            video[frame_num, :, :] = draw_contours(scale_bool(frame.values), contours)
+    ds[VIDEO] = pack(video)
+    ds = ds.drop_vars(ROI)
+    ds.to_netcdf(
+        path=destination, encoding={VIDEO: get_encoding(ds[VIDEO], LAYOUTS["filled"])}
+    )
+    clear_uncompressed(destination)
+    record_processed(destination, sources=sources, stage=stage)
+
+
 if __name__ == "__main__":
     invoke(Fill)
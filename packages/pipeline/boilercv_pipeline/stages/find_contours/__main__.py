@@ -8,29 +8,43 @@ from boilercv.data import VIDEO
 from boilercv.images import scale_bool
 from boilercv.images.cv import find_contours
 from boilercv.types import DF, Vid
+from boilercv_pipeline.images import get_offsets
 from boilercv_pipeline.parser import invoke
-from boilercv_pipeline.sets import get_dataset, get_unprocessed_destinations
+from boilercv_pipeline.sets import (
+    clear_uncompressed,
+    get_dataset,
+    get_stage_hash,
+    is_processed,
+    record_processed,
+)
 from boilercv_pipeline.stages.find_contours import FindContours
 
+VIDEO_SOURCE = "sources"
+"""Dependency holding videos to process."""
+
 
 def main(params: FindContours):
     logger.info("Start finding contours")
-    destinations = get_unprocessed_destinations(
-        params.outs.contours, sources=params.deps.sources, ext="h5"
-    )
-    for source_name, destination in tqdm(destinations.items()):
-        video: Vid = bitwise_not(  # pyright: ignore[reportAssignmentType]
-            scale_bool(
-                get_dataset(
-                    source_name, sources=params.deps.sources, rois=params.deps.rois
-                )[VIDEO].values
-            )
-        )
-        df = get_all_contours(video, method=CHAIN_APPROX_SIMPLE)
-        df.to_hdf(destination, key="contours", complib="zlib", complevel=9)
+    for source in tqdm(sorted(params.deps.sources.iterdir())):
+        process_video(params, source.stem)
     logger.info("Finish finding contours")
 
 
+def process_video(params: FindContours, name: str):
+    destination = params.outs.contours / f"{name}.h5"
+    sources = [params.deps.sources / f"{name}.nc", params.deps.rois / f"{name}.nc"]
+    stage = get_stage_hash(params)
+    if is_processed(destination, sources=sources, stage=stage):
+        return
+    da = get_dataset(name, sources=params.deps.sources, rois=params.deps.rois)[VIDEO]
+    video: Vid = bitwise_not(scale_bool(da.values))  # pyright: ignore[reportAssignmentType]
+    # Videos may be cropped, so offset contours to their pixel coordinates in the frame
+    df = get_all_contours(video, method=CHAIN_APPROX_SIMPLE) + get_offsets(da)
+    df.to_hdf(destination, key="contours", complib="zlib", complevel=9)
+    clear_uncompressed(destination)
+    record_processed(destination, sources=sources, stage=stage)
+
+
 def get_all_contours(video: Vid, method) -> DF:
     """Get all contours in a video.
 
@@ -1,14 +1,20 @@
 from functools import partial
 from pathlib import Path
 from typing import Annotated as Ann
+from typing import Any
 
 from cappa.arg import Arg
 from cappa.base import command
+from context_models.validators import ContextAfterValidator
 from matplotlib.figure import Figure
+from numpy import arange, column_stack, empty, full, pi, sqrt, vstack
 from pandas import DataFrame
-from pydantic import AfterValidator, Field
+from pydantic import AfterValidator, Field, model_validator
 
 from boilercv.data import FRAME, PX, XPX, YPX, X, Y
+from boilercv.images.cv import fill_holes, find_components
+from boilercv.types import DA
+from boilercv_pipeline.images import get_offsets
 from boilercv_pipeline.models import columns, data, stage
 from boilercv_pipeline.models.column import Col, ConstCol, Kind, LinkedCol
 from boilercv_pipeline.models.columns import get_cols
@@ -20,7 +26,9 @@ from boilercv_pipeline.models.subcool import (
     FilledParams,
     validate_time_suffixed_paths,
 )
+from boilercv_pipeline.nbs import COMPONENTS_TAG, CONTOURS_TAG
 from boilercv_pipeline.parser import PairedArg
+from boilercv_pipeline.sync_dvc.validators import dvc_remove_deps_if_enabled
 
 
 class Deps(FilledDeps):
@@ -100,6 +108,9 @@ class Cols(columns.Cols):
         return [*self.get_indices(), *get_cols(self, D.geo)]  # pyright: ignore[reportReturnType]
 
 
+C = Cols()
+
+
 @command(
     invoke="boilercv_pipeline.stages.find_objects.__main__.main", default_long=True
 )
@@ -132,6 +143,18 @@ class FindObjects(FilledParams[Deps, Outs, Data]):
         ),
     ] = Field(default_factory=list)
     """Paths to contours."""
+    components: Ann[
+        bool,
+        PairedArg("components"),
+        ContextAfterValidator(
+            partial(dvc_remove_deps_if_enabled, deps_field="deps", removed=["contours"])
+        ),
+    ] = False
+    """Find objects as connected components of binarized videos, not from contours.
+
+    Video names, slicers, and `filled` paths then come from binarized videos, and
+    neither contours nor filled videos are stage dependencies.
+    """
     dfs: Ann[
         list[Path],
         Arg(hidden=True),
@@ -145,3 +168,52 @@ class FindObjects(FilledParams[Deps, Outs, Data]):
             )
         ),
     ] = Field(default_factory=list)
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_components(cls, data: Any) -> Any:
+        """List binarized rather than filled videos when finding components."""
+        if (
+            isinstance(data, dict)
+            and data.get("components")
+            and isinstance(deps := data.get("deps", {}), dict)
+        ):
+            return {**data, "deps": {"filled": paths.sources, **deps}}
+        return data
+
+    @property
+    def skip_tags(self) -> list[str]:
+        """Tags of notebook cells to skip."""
+        return [CONTOURS_TAG] if self.components else [COMPONENTS_TAG]
+
+
+def get_components(video: DA) -> DataFrame:
+    """Get objects as connected components of dark regions in binarized videos.
+
+    Holes in objects are filled, as when filling contours. Centroids and areas are of
+    the pixels in each object, rather than of polygons bounded by their contours.
+    """
+    offsets = get_offsets(video)
+    # Stack arrays and build the data frame at the end to avoid per-frame overhead
+    tables = [empty((0, 5))]
+    for frame, img in zip(video[FRAME].values, video.values, strict=True):
+        stats, centroids = find_components(fill_holes(~img))
+        tables.append(
+            column_stack([
+                full(len(stats), frame),
+                arange(len(stats)),
+                centroids + offsets,
+                stats[:, -1],
+            ])
+        )
+    return (
+        DataFrame(
+            vstack(tables),
+            columns=[c() for c in (C.frame, C.contour, C.y, C.x, C.area)],
+        )
+        .astype({C.frame(): int, C.contour(): int})
+        .assign(**{
+            C.diameter(): lambda df: sqrt(4 * df[C.area()] / pi),
+            C.radius_of_gyration(): lambda df: df[C.diameter()] / 4,
+        })[[c() for c in C.dests]]
+    )
@@ -1,10 +1,9 @@
-from concurrent.futures import ProcessPoolExecutor
 from functools import partial
 
 from more_itertools import one
 
 from boilercv_pipeline.dfs import save_df
-from boilercv_pipeline.nbs import callbacks, submit_nb_process
+from boilercv_pipeline.nbs import Writer, callbacks, get_nb_executor, submit_nb_process
 from boilercv_pipeline.parser import invoke
 from boilercv_pipeline.plotting import save_plots
 from boilercv_pipeline.stages.find_objects import FindObjects as Params
@@ -12,7 +11,15 @@ from boilercv_pipeline.stages.find_objects import FindObjects as Params
 
 def main(params: Params):
     nb = params.deps.nb.read_text(encoding="utf-8")
-    with ProcessPoolExecutor(max_workers=4) as executor:
+    with (
+        Writer() as writer,
+        get_nb_executor(
+            nb=nb,
+            max_workers=params.max_workers,
+            start_method=params.start_method,
+            max_tasks_per_child=params.max_tasks_per_child,
+        ) as executor,
+    ):
         for time, filled, filled_slicers, contours, dfs in zip(
             params.times,
             params.filled,
@@ -30,18 +37,20 @@ def main(params: Params):
             }.items():
                 setattr(_params, field, [value])
             submit_nb_process(
-                executor=executor, nb=nb, params=_params
+                executor=executor, nb=nb, params=_params, skip_tags=params.skip_tags
             ).add_done_callback(
                 partial(
                     callbacks,
                     callbacks=[
                         partial(
-                            lambda f, p: save_df(df=f.result().dfs.dst, path=p),
+                            lambda f, p: writer.submit(
+                                save_df, df=f.result().dfs.dst, path=p
+                            ),
                             p=one(_params.dfs),
                         ),
                         partial(
-                            lambda f, p, s: save_plots(
-                                plots=f.result().plots, path=p, suffix=s
+                            lambda f, p, s: writer.submit(
+                                save_plots, plots=f.result().plots, path=p, suffix=s
                             ),
                             p=_params.outs.plots,
                             s=time,
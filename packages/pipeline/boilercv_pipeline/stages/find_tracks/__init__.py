@@ -30,6 +30,8 @@ from boilercv_pipeline.models.subcool import (
     FilledParams,
     validate_time_suffixed_paths,
 )
+from boilercv_pipeline.nbs import DFS_TAG, PLOTS_TAG
+from boilercv_pipeline.parser import PairedArg
 from boilercv_pipeline.stages import find_objects
 
 
@@ -43,6 +45,7 @@ class Deps(FilledDeps):
 class Outs(DfsPlotsOuts):
     dfs: DataDir = paths.tracks
     plots: DataDir = paths.tracks_plots
+    track_table: DataDir = paths.track_table
 
 
 class Dfs(data.Dfs):
@@ -231,3 +234,16 @@ class FindTracks(FilledParams[Deps, Outs, Data]):
             )
         ),
     ] = Field(default_factory=list)
+    """Paths to data frame stage outputs."""
+    plot: Ann[bool, PairedArg("plot")] = True
+    """Generate plots. Otherwise, only produce data frames."""
+    load_dfs_from_outs: Ann[bool, PairedArg("load_dfs_from_outs")] = False
+    """Load data frames from outputs, e.g. to only generate plots."""
+
+    @property
+    def skip_tags(self) -> list[str]:
+        """Tags of notebook cells to skip."""
+        return [
+            *([] if self.plot else [PLOTS_TAG]),
+            *([DFS_TAG] if self.load_dfs_from_outs else []),
+        ]
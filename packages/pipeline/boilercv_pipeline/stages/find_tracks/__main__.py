@@ -1,19 +1,32 @@
-from concurrent.futures import ProcessPoolExecutor
 from functools import partial
 
 from more_itertools import one
+from pandas import Series, read_hdf
 
-from boilercv_pipeline.dfs import save_dfs
-from boilercv_pipeline.models.path import get_time
-from boilercv_pipeline.nbs import callbacks, submit_nb_process
+from boilercv_pipeline.dfs import append_partition, get_partitions, save_dfs
+from boilercv_pipeline.models.path import get_datetime, get_time
+from boilercv_pipeline.nbs import Writer, callbacks, get_nb_executor, submit_nb_process
 from boilercv_pipeline.parser import invoke
 from boilercv_pipeline.plotting import save_plots
+from boilercv_pipeline.stages import get_thermal_data
 from boilercv_pipeline.stages.find_tracks import FindTracks as Params
 
+TC = get_thermal_data.Cols()
+
 
 def main(params: Params):
     nb = params.deps.nb.read_text(encoding="utf-8")
-    with ProcessPoolExecutor(max_workers=4) as executor:
+    subcooling = read_hdf(params.deps.thermal).set_index(TC.time())[TC.subcool()]
+    backfill_track_table(params, subcooling)
+    with (
+        Writer() as writer,
+        get_nb_executor(
+            nb=nb,
+            max_workers=params.max_workers,
+            start_method=params.start_method,
+            max_tasks_per_child=params.max_tasks_per_child,
+        ) as executor,
+    ):
         for filled, filled_slicers, objects, dfs in zip(
             params.filled,
             params.filled_slicers,
@@ -30,29 +43,58 @@ def main(params: Params):
                 "dfs": dfs,
             }.items():
                 setattr(_params, field, [value])
+            save_dfs_callback = partial(
+                lambda f, p: writer.submit(
+                    save_dfs, dfs=f.result().dfs.model_dump(), path=p
+                ),
+                p=one(_params.dfs),
+            )
+            append_partition_callback = partial(
+                lambda f, p, t, s: writer.submit(
+                    append_partition,
+                    df=f.result().dfs.dst.assign(**{TC.subcool(): s}),
+                    path=p,
+                    partition=t,
+                ),
+                p=_params.outs.track_table,
+                t=time,
+                s=subcooling[get_datetime(time)],
+            )
+            save_plots_callback = partial(
+                lambda f, p, s: writer.submit(
+                    save_plots, plots=f.result().plots, path=p, suffix=s
+                ),
+                p=_params.outs.plots,
+                s=time,
+            )
             submit_nb_process(
-                executor=executor, nb=nb, params=_params
+                executor=executor, nb=nb, params=_params, skip_tags=params.skip_tags
             ).add_done_callback(
                 partial(
                     callbacks,
                     callbacks=[
-                        partial(
-                            lambda f, p: save_dfs(
-                                dfs=f.result().dfs.model_dump(), path=p
-                            ),
-                            p=one(_params.dfs),
-                        ),
-                        partial(
-                            lambda f, p, s: save_plots(
-                                plots=f.result().plots, path=p, suffix=s
-                            ),
-                            p=_params.outs.plots,
-                            s=time,
-                        ),
+                        *([] if params.load_dfs_from_outs else [save_dfs_callback]),
+                        append_partition_callback,
+                        *([save_plots_callback] if params.plot else []),
                     ],
                 )
             )
 
 
+def backfill_track_table(params: Params, subcooling: Series):
+    existing = get_partitions(params.outs.track_table)
+    for filled, dfs in zip(params.filled, params.dfs, strict=True):
+        time = get_time(filled)
+        if time in existing or not dfs.exists():
+            continue
+        append_partition(
+            df=read_hdf(dfs, key="dst").assign(**{  # pyright: ignore[reportCallIssue]
+                TC.subcool(): subcooling[get_datetime(time)]
+            }),
+            path=params.outs.track_table,
+            partition=time,
+        )
+
+
 if __name__ == "__main__":
     invoke(Params)
@@ -4,7 +4,7 @@ from tqdm import tqdm
 from boilercv.data import FRAME, VIDEO
 from boilercv_pipeline.parser import invoke
 from boilercv_pipeline.preview import new_videos_to_preview
-from boilercv_pipeline.sets import get_dataset
+from boilercv_pipeline.sets import get_dataset, get_stage_hash
 from boilercv_pipeline.stages.preview_filled import PreviewFilled
 
 
@@ -12,9 +12,8 @@ def main(params: PreviewFilled):
     logger.info("Start updating filled preview")
     stage = "filled"
     destination = params.outs.filled_preview
-    # TODO: Figure out out-of-order preview frames to avoid reprocessing frames
     with new_videos_to_preview(
-        destination, reprocess=True, sources=params.deps.filled
+        destination, sources=params.deps.filled, stage=get_stage_hash(params)
     ) as videos_to_preview:
         for video_name in tqdm(videos_to_preview):
             ds = get_dataset(
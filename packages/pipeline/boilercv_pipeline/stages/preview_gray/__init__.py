@@ -13,7 +13,7 @@ from boilercv_pipeline.models.paths import paths
 
 class Deps(stage.Deps):
     stage: DirectoryPathSerPosix = Path(__file__).parent
-    large_sources: DataDir = paths.large_sources
+    stats: DataDir = paths.stats
 
 
 class Outs(stage.Outs):
@@ -0,0 +1,122 @@
+"""Detect the boiling surface in each frame of a video.
+
+The boiling surface is the most prominent horizontal line near the bottom middle of
+each frame. Surfaces are returned as compact rows of `(ypx, xpx_left, xpx_right)` per
+frame, so that surface position can be tracked over time.
+"""
+
+from cv2 import blur, cornerHarris
+from numpy import (
+    append,
+    arange,
+    bincount,
+    empty,
+    flatnonzero,
+    float32,
+    full,
+    iinfo,
+    int64,
+    lexsort,
+    maximum,
+    minimum,
+    rint,
+    zeros,
+)
+from scipy.ndimage import label
+
+from boilercv.types import ArrInt, Vid, VidBool
+
+KSIZE = (9, 3)
+"""Size of the blur kernel (width, height), which enhances horizontal lines."""
+THRESHOLD = 0.6
+"""Threshold of scaled line prominence, above which pixels may be on the surface."""
+MIN_SIZE_PX = 8
+"""Objects must be larger than this to be considered the boiling surface."""
+NO_SURFACE = -1
+"""Fill value for frames in which no boiling surface is found."""
+
+
+def find_surfaces(video: Vid, min_size_px: int = MIN_SIZE_PX) -> ArrInt:
+    """Find the boiling surface in each frame of a video.
+
+    Returns rows of `(ypx, xpx_left, xpx_right)`, one per frame, filled with
+    `NO_SURFACE` for frames without a surface. The surface is the largest object of
+    prominent horizontal lines centered in the bottom half of the frame and within an
+    eighth of the frame width from the middle.
+    """
+    video = video.reshape(-1, *video.shape[-2:])
+    num_frames, height, width = video.shape
+    labels, _num_labels = label_candidates(find_candidates(video))
+
+    # Get sizes, centers, and frames of all objects at once, with background excluded
+    frames, ypx, xpx = labels.nonzero()
+    pixel_labels = labels[frames, ypx, xpx]
+    sizes = bincount(pixel_labels)
+    counts = sizes.clip(min=1)
+    ypx_centers = rint(bincount(pixel_labels, ypx, sizes.size) / counts)
+    xpx_centers = rint(bincount(pixel_labels, xpx, sizes.size) / counts)
+    label_frames = zeros(sizes.size, dtype=int64)
+    label_frames[pixel_labels] = frames
+
+    # Find objects in range, then the largest such object in each frame, preferring
+    # lower labels among objects of equal size
+    candidates = flatnonzero(
+        (sizes > min_size_px)
+        & (ypx_centers > height / 2)
+        & (abs(xpx_centers - width / 2) < width / 8)
+    )
+    candidates = candidates[
+        lexsort((-candidates, sizes[candidates], label_frames[candidates]))
+    ]
+    candidate_frames = label_frames[candidates]
+    is_last = candidate_frames != append(candidate_frames[1:], NO_SURFACE)
+    is_surface = zeros(sizes.size, dtype=bool)
+    is_surface[candidates[is_last]] = True
+
+    # Get a horizontal line spanning the surface in each frame
+    on_surface = is_surface[pixel_labels]
+    frames, ypx, xpx = frames[on_surface], ypx[on_surface], xpx[on_surface]
+    surfaces = full((num_frames, 3), NO_SURFACE, dtype=int64)
+    surface_sizes = bincount(frames, minlength=num_frames)
+    found = surface_sizes > 0
+    surfaces[found, 0] = rint(
+        bincount(frames, ypx, num_frames)[found] / surface_sizes[found]
+    )
+    left = full(num_frames, iinfo(int64).max)
+    minimum.at(left, frames, xpx)
+    right = full(num_frames, NO_SURFACE, dtype=int64)
+    maximum.at(right, frames, xpx)
+    surfaces[found, 1] = left[found]
+    surfaces[found, 2] = right[found]
+    return surfaces
+
+
+def find_candidates(video: Vid) -> VidBool:
+    """Find pixels on prominent horizontal lines in each frame of a video."""
+    lines = empty(video.shape, dtype=float32)
+    for frame, img in enumerate(video):
+        # Lines are prominent where corners are not
+        corners = cornerHarris(src=img, blockSize=2, ksize=3, k=0.04)
+        blur(-corners, ksize=KSIZE, dst=lines[frame])
+    # Threshold lines scaled to the range of each frame, without dividing
+    lower = lines.min(axis=(-2, -1), keepdims=True)
+    upper = lines.max(axis=(-2, -1), keepdims=True)
+    return lines - lower > THRESHOLD * (upper - lower)
+
+
+def label_candidates(candidates: VidBool) -> tuple[ArrInt, int]:
+    """Label diagonally-connected objects in each frame, uniquely across frames."""
+    # Connect neighbors within frames but not across them
+    structure = zeros((3, 3, 3), dtype=bool)
+    structure[1] = True
+    return label(input=candidates, structure=structure)  # pyright: ignore[reportReturnType]
+
+
+def draw_surfaces(surfaces: ArrInt, shape: tuple[int, int]) -> VidBool:
+    """Draw surfaces found in each frame as horizontal lines, one pixel thick."""
+    ypx, xpx = arange(shape[0]), arange(shape[1])
+    return (
+        (ypx[:, None] == surfaces[:, None, None, 0])
+        & (xpx >= surfaces[:, None, None, 1])
+        & (xpx <= surfaces[:, None, None, 2])
+    )
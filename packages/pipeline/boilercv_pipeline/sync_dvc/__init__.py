@@ -11,6 +11,10 @@ class Constants(BaseModel):
 
     table_key: str = "stage"
     """Key for the global parameters table."""
+    stages_key: str = "stages"
+    """Key for stages in `dvc.yaml`."""
+    deps_key: str = "deps"
+    """Field of stage models holding their dependencies."""
 
 
 const = Constants()
@@ -30,3 +34,7 @@ class SyncDvc(BaseModel):
     """Dotted module path to the package containing stages."""
     update_param_values: bool = Field(default=False)
     """Update values of parameters in the parameters YAML file."""
+    incremental: bool = Field(default=False)
+    """Only regenerate stages whose model, code, parameters, or dependencies changed."""
+    hashes: Path = Path(".cache/sync_dvc.json")
+    """Stage hashes from the last sync, consulted when syncing incrementally."""
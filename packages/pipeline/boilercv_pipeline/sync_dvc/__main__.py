@@ -1,8 +1,10 @@
 """Sync `dvc.yaml` and `params.yaml` with pipeline specification."""
 
 from collections.abc import Sized
+from hashlib import sha256
 from importlib import import_module
 from inspect import getfile, getmembers
+from json import dumps, loads
 from pathlib import Path
 from types import NoneType
 from typing import Any, get_args
@@ -11,10 +13,18 @@ from boilercv_dev.tools.environment import run
 from cappa.base import invoke
 from context_models import CONTEXT, PLUGIN_SETTINGS, ContextStore
 from more_itertools import first, one
-from pydantic import create_model
+from pydantic import BaseModel, create_model
 from pydantic.alias_generators import to_pascal
+from pydantic.json_schema import (
+    CoreSchemaOrField,
+    GenerateJsonSchema,
+    JsonSchemaValue,
+    JsonSchemaWarningKind,
+)
+from pydantic_core import PydanticOmit
 from yaml import safe_dump, safe_load
 
+from boilercv_pipeline.sets import hash_code
 from boilercv_pipeline.sync_dvc import SyncDvc, const
 from boilercv_pipeline.sync_dvc.contexts import DVC, DvcContext, DvcContexts
 from boilercv_pipeline.sync_dvc.dvc import DvcYamlModel, Stage
@@ -23,53 +33,200 @@ from boilercv_pipeline.sync_dvc.types import Model
 
 def main(params: SyncDvc):
     """Sync `dvc.yaml` and `params.yaml` with pipeline specification."""
-    dvc = get_dvc_context(
-        params=(
-            safe_load(params.params.read_text(encoding="utf-8"))
-            if params.params.exists()
-            else {}
-        ),
-        stages=params.stages,
+    pipeline = params.root / params.pipeline
+    params_file = params.root / params.params
+    hashes_file = params.root / params.hashes
+    existing_params = load_yaml(params_file)
+    existing_pipeline = load_yaml(pipeline)
+    existing_stages = existing_pipeline.get(const.stages_key, {})
+    stage_models = get_stage_models(params.stages)
+    hashes = {
+        name: hash_stage(model, existing_params) for name, model in stage_models.items()
+    }
+    previous_hashes = (
+        loads(hashes_file.read_text(encoding="utf-8"))
+        if params.incremental and hashes_file.exists()
+        else {}
     )
-    (params.root / params.pipeline).write_text(
-        encoding="utf-8",
-        data=safe_dump(
-            indent=2,
-            width=float("inf"),
-            data=dvc_clear_defaults(dvc.model).model_dump(exclude_none=True),
-        ),
+    changed = get_changed_stages(
+        stage_models,
+        hashes,
+        previous_hashes,
+        existing_stages,
+        incremental=params.incremental,
     )
-    (params.root / params.params).write_text(
-        encoding="utf-8",
-        data=safe_dump(
-            indent=2,
-            width=float("inf"),
-            data={
-                **dvc.params,
-                **(
-                    {}
-                    if params.update_param_values or not params.params.exists()
-                    else {
-                        k: v
-                        for k, v in safe_load(
-                            params.params.read_text(encoding="utf-8")
-                        ).items()
-                        if k in dvc.params
-                    }
-                ),
-            },
-        ),
+    removed = set(existing_stages) - set(stage_models)
+    dvc_yaml: dict[str, Any] = {const.stages_key: {}}
+    generated_params: dict[str, Any] = {}
+    if changed:
+        dvc = get_dvc_context(params=existing_params, stage_models=changed)
+        dvc_yaml = dvc_clear_defaults(dvc.model).model_dump(exclude_none=True)
+        generated_params = dvc.params
+    written: list[Path] = []
+    if changed or removed:
+        if params.incremental:
+            dvc_yaml = {
+                **existing_pipeline,
+                **dvc_yaml,
+                const.stages_key: {
+                    name: stage
+                    for name, stage in existing_stages.items()
+                    if name not in removed
+                }
+                | dvc_yaml[const.stages_key],
+            }
+        dump_yaml(pipeline, dvc_yaml)
+        written.append(pipeline)
+        synced_params = sync_params(
+            generated_params,
+            existing_params,
+            update=params.update_param_values,
+            incremental=params.incremental,
+        )
+        if not params.incremental or synced_params != existing_params:
+            dump_yaml(params_file, synced_params)
+            written.append(params_file)
+    hashes_file.parent.mkdir(parents=True, exist_ok=True)
+    hashes_file.write_text(encoding="utf-8", data=dumps(hashes, indent=2))
+    if written:
+        run(
+            "pre-commit run prettier --files",
+            *(path.as_posix() for path in written),
+            check=False,
+            capture_output=True,
+        )
+
+
+def load_yaml(path: Path) -> dict[str, Any]:
+    """Load a YAML file, or an empty mapping if it doesn't exist."""
+    return (safe_load(path.read_text(encoding="utf-8")) or {}) if path.exists() else {}
+
+
+def dump_yaml(path: Path, data: dict[str, Any]):
+    """Dump a mapping to a YAML file."""
+    path.write_text(
+        encoding="utf-8", data=safe_dump(indent=2, width=float("inf"), data=data)
     )
-    run("pre-commit run --all-files prettier", check=False, capture_output=True)
 
 
-def get_dvc_context(params: dict[str, Any], stages: str) -> DvcContext:
-    """Get DVC context for pipeline model and stages."""
-    stage_models = {
+def sync_params(
+    params: dict[str, Any],
+    existing: dict[str, Any],
+    update: bool = False,
+    incremental: bool = False,
+) -> dict[str, Any]:
+    """Sync generated parameters with existing parameters.
+
+    Existing parameter tables take precedence over generated ones unless `update` is
+    set. When syncing incrementally, only parameters of regenerated stages are
+    generated, so tables are merged key-by-key and no existing parameters are dropped.
+    """
+    if not incremental:
+        return {
+            **params,
+            **(
+                {}
+                if update or not existing
+                else {k: v for k, v in existing.items() if k in params}
+            ),
+        }
+    return {
+        **existing,
+        **{
+            k: (
+                {**existing.get(k, {}), **v} if update else {**v, **existing.get(k, {})}
+            )
+            for k, v in params.items()
+        },
+    }
+
+
+def get_changed_stages(
+    stage_models: dict[str, type[BaseModel]],
+    hashes: dict[str, str],
+    previous_hashes: dict[str, str],
+    existing_stages: dict[str, Any],
+    incremental: bool = False,
+) -> dict[str, type[BaseModel]]:
+    """Get stages to regenerate.
+
+    All stages are regenerated unless syncing incrementally, in which case only stages
+    missing from the existing pipeline or whose hashes changed are regenerated.
+    """
+    return {
+        name: model
+        for name, model in stage_models.items()
+        if not incremental
+        or name not in existing_stages
+        or previous_hashes.get(name) != hashes[name]
+    }
+
+
+def get_stage_models(stages: str) -> dict[str, type[BaseModel]]:
+    """Get stage models from the package containing stages."""
+    return {
         p.stem: dict(getmembers(import_module(f"{stages}.{p.stem}")))[to_pascal(p.stem)]
         for p in Path(getfile(import_module(stages))).parent.iterdir()
         if not p.stem.startswith("_")
     }
+
+
+class StageSchema(GenerateJsonSchema):
+    """Stage model schema, omitting fields not representable in JSON schema."""
+
+    def handle_invalid_for_json_schema(
+        self,
+        schema: CoreSchemaOrField,  # noqa: ARG002
+        error_info: str,  # noqa: ARG002
+    ) -> JsonSchemaValue:
+        """Omit fields such as figures and data frames from the schema."""
+        raise PydanticOmit
+
+    def emit_warning(self, kind: JsonSchemaWarningKind, detail: str):
+        """Don't warn about omitted defaults."""
+
+
+def hash_stage(model: type[BaseModel], params: dict[str, Any]) -> str:
+    """Hash a stage model schema along with its parameter values.
+
+    Also hashes the code of the stage and the first-party modules it imports, such as
+    its validators, and listings of its dependency directories, since stage entries
+    such as timestamp-suffixed plots are derived from them.
+    """
+    return sha256(
+        dumps(
+            {
+                "schema": model.model_json_schema(schema_generator=StageSchema),
+                "params": {
+                    k: v
+                    for k, v in params.get(const.table_key, {}).items()
+                    if k in model.model_fields
+                },
+                "code": hash_code(model.__module__),
+                "listings": get_dep_listings(model),
+            },
+            sort_keys=True,
+            default=str,
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def get_dep_listings(model: type[BaseModel]) -> dict[str, list[str]]:
+    """Get names of files in the default dependency directories of a stage model."""
+    deps = model.model_fields.get(const.deps_key)
+    if not deps or not isinstance(deps.annotation, type):
+        return {}
+    return {
+        Path(path).as_posix(): sorted(p.name for p in Path(path).iterdir())
+        for field in deps.annotation.model_fields.values()
+        if isinstance(path := field.default, Path) and path.is_dir()
+    }
+
+
+def get_dvc_context(
+    params: dict[str, Any], stage_models: dict[str, type[BaseModel]]
+) -> DvcContext:
+    """Get DVC context for pipeline model and stages."""
     stage = first(stage_models.values())
 
     class CombinedContext(stage.model_fields["context"].annotation, DvcContexts): ...
@@ -86,7 +243,7 @@ def get_dvc_context(params: dict[str, Any], stages: str) -> DvcContext:
         **{
             field: {
                 k: (("--no" not in v) if isinstance(v, str) and "--" in v else v)
-                for k, v in params[const.table_key].items()
+                for k, v in params.get(const.table_key, {}).items()
                 if k in stage.model_fields
             }
             for field, stage in stage_models.items()
@@ -135,6 +135,20 @@ def dvc_set_stage_path(
     return path
 
 
+def dvc_remove_deps_if_enabled(
+    enabled: bool, info: DvcValidationInfo, deps_field: str, removed: list[str]
+) -> bool:
+    """Remove stage deps for `dvc.yaml` left unused if a switch is enabled."""
+    if info.field_name != CONTEXT and (dvc := info.context.get(DVC)) and enabled:
+        deps = info.data[deps_field]
+        removed_paths = {
+            Path(getattr(deps, field)).resolve().relative_to(Path.cwd()).as_posix()
+            for field in removed
+        }
+        dvc.stage.deps = [dep for dep in dvc.stage.deps if dep not in removed_paths]
+    return enabled
+
+
 def dvc_append_plot_name(figure: Figure, info: DvcValidationInfo) -> Figure:
     """Append plot name for `dvc.yaml`."""
     if info.field_name != CONTEXT and (dvc := info.context.get(DVC)):
@@ -1,7 +1,11 @@
 """Pipeline types."""
 
-from typing import TypeAlias, TypeVar
+from typing import Literal, TypeAlias, TypeVar
 
 T = TypeVar("T")
 Slicer: TypeAlias = tuple[int, int]
 Slicer2D: TypeAlias = tuple[Slicer, Slicer]
+StartMethod: TypeAlias = Literal["spawn", "fork", "forkserver"]
+"""Process start method."""
+Codec: TypeAlias = Literal["zlib", "none"]
+"""Compression codec of videos on disk. Others need HDF5 plugins to read via netCDF4."""
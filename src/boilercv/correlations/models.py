@@ -32,6 +32,7 @@ from boilercv.pipelines import (
     Defaults,
     Pipeline,
     PipelineBase,
+    cache_context,
     compose_contexts,
     make_pipelines,
 )
@@ -52,6 +53,7 @@ class Metadata(Pipeline[AnyEquation, EquationMetadata]):
     """Equations."""
 
     @classmethod
+    @cache_context
     def get_context(cls) -> PipelineCtx:
         """Get context."""
         return compose_contexts(
@@ -63,6 +65,7 @@ class Expectations(Pipeline[K, Expectation], Generic[K]):
     """Expectations."""
 
     @classmethod
+    @cache_context
     def get_context(cls) -> PipelineCtx:
         """Get Pydantic context."""
         return cls.compose_defaults(value=nan)
@@ -72,6 +75,7 @@ class Forms(Pipeline[Kind, str]):
     """Forms."""
 
     @classmethod
+    @cache_context
     def get_context(cls) -> PipelineCtx:
         """Get context."""
         return compose_contexts(cls.compose_defaults(value=""))
@@ -81,6 +85,7 @@ class Params(Pipeline[K, Forms], Generic[K]):
     """Parameters."""
 
     @classmethod
+    @cache_context
     def get_context(cls) -> PipelineCtx:
         """Get Pydantic context."""
         return compose_contexts(
@@ -117,6 +122,7 @@ class EquationForms(PipelineBase, Generic[EQ]):
     """Symbolic form."""
 
     @classmethod
+    @cache_context
     def get_context(
         cls,
         symbols: Iterable[str] | None = None,
@@ -136,6 +142,7 @@ class Equations(Pipeline[Equation, EquationForms[EQ]], Generic[EQ]):
     """Equations."""
 
     @classmethod
+    @cache_context
     def get_context(
         cls,
         symbols: Iterable[str] | None = None,
@@ -163,6 +170,7 @@ class Solutions(PipelineBase):
     """Warnings."""
 
     @classmethod
+    @cache_context
     def get_context(cls, symbols: Iterable[str]) -> PipelineCtx:
         """Get Pydantic context."""
         return compose_sympify_context(symbols)  # for `Expr`
@@ -172,6 +180,7 @@ class SymbolSolutions(Pipeline[S, Solutions], Generic[S]):
     """Solutions for given symbols."""
 
     @classmethod
+    @cache_context
     def get_context(
         cls, symbols: Iterable[str], solve_syms: tuple[S, ...] | None = None
     ) -> PipelineCtx:
@@ -185,6 +194,7 @@ class EquationSolutions(Pipeline[Equation, SymbolSolutions[S]], Generic[S]):
     """Equation solutions."""
 
     @classmethod
+    @cache_context
     def get_context(
         cls, symbols: Iterable[str], solve_syms: tuple[str, ...] | None = None
     ) -> PipelineCtx:
@@ -209,6 +219,7 @@ class SolvedEquations(PipelineBase, Generic[S]):
     """Solutions."""
 
     @classmethod
+    @cache_context
     def get_context(
         cls, symbols: Iterable[str], solve_syms: tuple[str, ...]
     ) -> PipelineCtx:
@@ -1,10 +1,15 @@
 """Dataframes."""
 
-from numpy import split
-from pandas import DataFrame, concat
+from numpy import arange, diff, repeat
+from pandas import DataFrame, MultiIndex
 
-from boilercv.data import YX_PX
-from boilercv.types import DF, ArrayLike
+from boilercv.data import FRAME, YX_PX
+from boilercv.types import DF, ArrayLike, ArrInt
+
+LINE_COLUMNS = MultiIndex.from_tuples(
+    [(dim, coord) for coord in (0, 1) for dim in YX_PX], names=["dim", "coord"]
+)
+"""Columns of line segments, the `(y, x)` dims of each of their two points."""
 
 
 def df_points(points: ArrayLike, dims: list[str] = YX_PX) -> DF:
@@ -16,12 +21,26 @@ def df_points(points: ArrayLike, dims: list[str] = YX_PX) -> DF:
     )
 
 
-def frame_lines(lines: ArrayLike) -> DF:
-    """Build a dataframe from an array of line segments."""
-    ordered_pairs = [df_points(point) for point in split(lines, 2, axis=1)]
-    return (
-        concat(axis="columns", keys=[0, 1], objs=ordered_pairs)
-        .rename_axis(axis="index", mapper="line")
-        .rename_axis(axis="columns", mapper=["coord", "dim"])
-        .reorder_levels(axis="columns", order=["dim", "coord"])
+def frame_lines(lines: ArrayLike, offsets: ArrInt | None = None) -> DF:
+    """Build a dataframe from an array of line segments, as rows of `(y0, x0, y1, x1)`.
+
+    Pass frame offsets, such as those from
+    `boilercv.images.cv.find_video_line_segments`, to build one flat table of line
+    segments in many frames, indexed by frame and line.
+    """
+    df = DataFrame(
+        columns=LINE_COLUMNS,
+        data=lines,  # pyright: ignore[reportArgumentType]
+    ).rename_axis(axis="index", mapper="line")
+    if offsets is None:
+        return df
+    counts = diff(offsets)
+    return df.set_index(
+        MultiIndex.from_arrays(
+            [
+                repeat(arange(counts.size), counts),
+                arange(offsets[-1]) - repeat(offsets[:-1], counts),
+            ],
+            names=[FRAME, "line"],
+        )
     )
@@ -1,6 +1,13 @@
-"""Packing and unpacking of binarized video data."""
+"""Packing and unpacking of binarized video data.
 
-from numpy import packbits, unpackbits
+Packed coordinates label the first pixel packed into each byte, so videos cropped from
+larger frames keep their pixel coordinates through packing and unpacking.
+"""
+
+from collections.abc import Callable
+from functools import partial
+
+from numpy import arange, packbits, unpackbits
 from xarray import apply_ufunc
 
 from boilercv.data import (
@@ -12,29 +19,40 @@ from boilercv.data import (
     XPX,
     XPX_PACKED,
 )
-from boilercv.types import DA
+from boilercv.types import DA, Img
+
+BITS = 8
+"""Bits packed into each byte."""
 
 
-def pack(da: DA) -> DA:
-    """Pack the bits in dimension of the data array."""
+def pack(da: DA, func: Callable[[Img], Img] | None = None) -> DA:
+    """Pack the bits in dimension of the data array.
+
+    Pass a function of the whole video to get packed bits some other way, such as
+    `boilercv.images.cv.binarize_video`. Bits are packed with `numpy.packbits` by
+    default.
+    """
+    x0 = int(da[XPX][0])
     return (
         apply_ufunc(
-            packbits,
+            func or partial(packbits, axis=PACKED_DIM_INDEX),
             da,
-            kwargs=dict(axis=PACKED_DIM_INDEX),
             input_core_dims=[DIMS],
             output_core_dims=[DIMS],
             exclude_dims={XPX},
             keep_attrs=True,
         )
         .rename({XPX: XPX_PACKED})
-        .assign_coords({XPX_PACKED: lambda da: da[XPX_PACKED].values})
+        .assign_coords({
+            XPX_PACKED: lambda da: x0 + BITS * arange(da.sizes[XPX_PACKED])
+        })
         .rename(f"{VIDEO}_{PACKED}")
     )
 
 
 def unpack(da: DA) -> DA:
     """Unpack the bits of the last image dimension of a data array."""
+    x0 = int(da[XPX_PACKED][0])
     return (
         apply_ufunc(
             unpackbits,
@@ -46,7 +64,7 @@ def unpack(da: DA) -> DA:
             keep_attrs=True,
         )
         .rename({XPX_PACKED: XPX})
-        .assign_coords({XPX: lambda da: da[XPX].values})
+        .assign_coords({XPX: lambda da: x0 + arange(da.sizes[XPX])})
         .rename(VIDEO)
         .astype(bool)
     )
@@ -0,0 +1,186 @@
+"""Reductions of videos over frames, streamed in chunks of frames.
+
+Videos opened lazily from disk are read one chunk of frames at a time, so reductions
+hold only a chunk and the result in memory, rather than the whole video. Frames may be
+subsampled by taking every `step`-th frame. Videos have frames along their first
+dimension. Statistics of whole videos combine these reductions, for computing once and
+reusing in later stages.
+"""
+
+from collections.abc import Iterator, Sequence
+from math import ceil
+
+from numpy import (
+    arange,
+    array,
+    bincount,
+    float64,
+    iinfo,
+    int64,
+    maximum,
+    minimum,
+    ufunc,
+    where,
+    zeros,
+)
+from xarray import DataArray, Dataset
+
+from boilercv.data import FRAME
+from boilercv.types import DA, DS, Img, Vid
+
+CHUNK_SIZE = 64
+"""Number of frames to read at a time."""
+PERCENTILES = [1, 50, 99]
+"""Percentiles of each pixel over frames to get in video statistics."""
+
+FIRST = "first"
+"""Name of the first frame in video statistics."""
+MIN = "min"
+"""Name of the minimum over frames in video statistics."""
+MAX = "max"
+"""Name of the maximum over frames in video statistics."""
+MEAN = "mean"
+"""Name of the mean over frames in video statistics."""
+PERCENTILE = "percentile"
+"""Name of percentiles over frames in video statistics."""
+PERCENT = "percent"
+"""Percent dimension name of percentiles in video statistics."""
+HISTOGRAM = "histogram"
+"""Name of the histogram of intensities in video statistics."""
+INTENSITY = "intensity"
+"""Intensity dimension name of the histogram in video statistics."""
+
+
+def max_frames(video: DA, chunk_size: int = CHUNK_SIZE, step: int = 1) -> DA:
+    """Get the maximum of each pixel over frames."""
+    return reduce_frames(video, maximum, chunk_size, step)
+
+
+def min_frames(video: DA, chunk_size: int = CHUNK_SIZE, step: int = 1) -> DA:
+    """Get the minimum of each pixel over frames."""
+    return reduce_frames(video, minimum, chunk_size, step)
+
+
+def mean_frames(video: DA, chunk_size: int = CHUNK_SIZE, step: int = 1) -> DA:
+    """Get the mean of each pixel over frames."""
+    total = zeros(video.shape[1:], dtype=float64)
+    for chunk in iter_chunks(video, chunk_size, step):
+        total += chunk.sum(axis=0, dtype=float64)
+    return get_image_da(video, total / count_frames(video, step))
+
+
+def percentile_frames(
+    video: DA, q: float, chunk_size: int = CHUNK_SIZE, step: int = 1
+) -> DA:
+    """Get a percentile of each pixel over frames of an integer video.
+
+    Gets the least value at or above `q` percent of frames, as in `numpy.percentile`
+    with the "inverted_cdf" method. Bisects the range of the video's data type, taking
+    one pass over the frames for each bit of the data type, e.g. eight for `uint8`.
+    """
+    return get_image_da(video, get_percentiles(video, [q], chunk_size, step)[0])
+
+
+def get_percentiles(
+    video: DA, q: Sequence[float], chunk_size: int = CHUNK_SIZE, step: int = 1
+) -> Img:
+    """Get percentiles of each pixel over frames of an integer video, all at once.
+
+    Bisects all percentiles together, in the same passes over the frames as for one.
+    """
+    num_frames = count_frames(video, step)
+    ranks = [max(ceil(q_ / 100 * num_frames), 1) for q_ in q]
+    info = iinfo(video.dtype)
+    lower = zeros((len(ranks), *video.shape[1:]), dtype=int64) + info.min
+    upper = zeros((len(ranks), *video.shape[1:]), dtype=int64) + info.max
+    while (lower < upper).any():
+        middle = (lower + upper) // 2
+        counts = zeros(middle.shape, dtype=int64)
+        for chunk in iter_chunks(video, chunk_size, step):
+            for i, mid in enumerate(middle):
+                counts[i] += (chunk <= mid).sum(axis=0)
+        reached = counts >= array(ranks).reshape(-1, 1, 1)
+        lower = where(reached, lower, middle + 1)
+        upper = where(reached, middle, upper)
+    return lower.astype(video.dtype)
+
+
+def get_stats(
+    video: DA,
+    percentiles: Sequence[float] = PERCENTILES,
+    chunk_size: int = CHUNK_SIZE,
+    step: int = 1,
+) -> DS:
+    """Get statistics of an unsigned integer video, to be computed once and reused.
+
+    Gets the first frame, and the minimum, maximum, mean, and percentiles of each pixel
+    over frames, along with a histogram of intensities over the whole video. Also gets
+    the number of frames and the shape of the video as attributes. All but percentiles
+    are reduced in a single pass over the frames.
+    """
+    info = iinfo(video.dtype)
+    histogram = zeros(info.max + 1, dtype=int64)
+    total = zeros(video.shape[1:], dtype=float64)
+    first = lower = upper = None
+    for chunk in iter_chunks(video, chunk_size, step):
+        if first is None:
+            first, lower, upper = chunk[0], chunk.min(axis=0), chunk.max(axis=0)
+        else:
+            minimum(lower, chunk.min(axis=0), out=lower)
+            maximum(upper, chunk.max(axis=0), out=upper)
+        total += chunk.sum(axis=0, dtype=float64)
+        histogram += bincount(chunk.ravel(), minlength=histogram.size)
+    if first is None:
+        raise ValueError("Can't get statistics of a video with no frames.")
+    num_frames = count_frames(video, step)
+    return Dataset(
+        data_vars={
+            FIRST: get_image_da(video, first),
+            MIN: get_image_da(video, lower),
+            MAX: get_image_da(video, upper),
+            MEAN: get_image_da(video, total / num_frames),
+            PERCENTILE: get_image_da(video, first)
+            .expand_dims({PERCENT: list(percentiles)})
+            .copy(data=get_percentiles(video, percentiles, chunk_size, step)),
+            HISTOGRAM: DataArray(
+                dims=INTENSITY, coords={INTENSITY: arange(info.max + 1)}, data=histogram
+            ),
+        },
+        attrs={"num_frames": num_frames, "shape": list(video.shape)},
+    )
+
+
+def reduce_frames(
+    video: DA, func: ufunc, chunk_size: int = CHUNK_SIZE, step: int = 1
+) -> DA:
+    """Reduce pixels over frames by a binary ufunc, such as `numpy.maximum`."""
+    result = None
+    for chunk in iter_chunks(video, chunk_size, step):
+        reduced = func.reduce(chunk, axis=0)
+        result = reduced if result is None else func(result, reduced)
+    if result is None:
+        raise ValueError("Can't reduce a video with no frames.")
+    return get_image_da(video, result)
+
+
+def iter_chunks(
+    video: DA, chunk_size: int = CHUNK_SIZE, step: int = 1
+) -> Iterator[Vid]:
+    """Iterate over chunks of frames of a video, read one chunk at a time."""
+    span = chunk_size * step
+    for start in range(0, video.sizes[FRAME], span):
+        yield video.isel({FRAME: slice(start, start + span, step)}).values
+
+
+def count_frames(video: DA, step: int = 1) -> int:
+    """Count the frames of a video, subsampled every `step` frames."""
+    return len(range(0, video.sizes[FRAME], step))
+
+
+def get_image_da(video: DA, img: Img) -> DA:
+    """Get an image shaped like a frame of the video, without frame coordinates."""
+    frame_coords = [name for name, coord in video.coords.items() if FRAME in coord.dims]
+    image = video.isel({FRAME: 0}).drop_vars(frame_coords).copy(data=img)
+    # Don't encode reductions like the video on disk, e.g. means as integers
+    image.encoding = {}
+    return image
@@ -3,14 +3,17 @@
 # * Pure numpy image processing functions take lots of types, including DataArrays.
 # pyright: reportGeneralTypeIssues=none
 
+from collections.abc import Iterable
+from functools import cache
+
 from matplotlib.font_manager import FontProperties, findfont
-from numpy import asarray, iinfo, invert, mean, uint8
+from numpy import array, asarray, iinfo, invert, mean, rint, uint8, unique
 from numpy.typing import DTypeLike
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 
 from boilercv.colors import BLACK, BLACK3, RED, WHITE, WHITE3
 from boilercv.images.types import T
-from boilercv.types import DA_T, Img, ImgLike
+from boilercv.types import DA_T, Img, ImgBool, ImgLike
 
 # * -------------------------------------------------------------------------------- * #
 # * PURE NUMPY - TYPE PRESERVING
@@ -95,3 +98,70 @@ def overlay(
         mask = Image.fromarray(invert(avg.astype(bool) * alpha).astype(uint8))
     composite = Image.composite(background, objects, mask)
     return asarray(composite)
+
+
+# * -------------------------------------------------------------------------------- * #
+# * BATCHED - WHOLE VIDEOS AT ONCE
+
+
+@cache
+def render_text(text: str) -> Img:
+    """Render a text label as drawn by `draw_text`, including its background.
+
+    Labels are rendered once and cached, then pasted into any number of frames.
+    """
+    _, _, font_bbox_width, font_bbox_height = FONT.getbbox(text)
+    pil_image = Image.new(
+        "L", (font_bbox_width + 2 * PAD, font_bbox_height + 2 * PAD + 1), BLACK
+    )
+    ImageDraw.Draw(pil_image).text((PAD, PAD), text, font=FONT, fill=WHITE)
+    label = asarray(pil_image)
+    label.flags.writeable = False
+    return label
+
+
+def draw_texts(images: Img, texts: Iterable[str]) -> Img:
+    """Draw text in the top-right corner of each image in a stack of images.
+
+    Equivalent to `draw_text` on each image, but each distinct label is rendered once,
+    then pasted into every image that shares it.
+
+    Args:
+        images: Stack of grayscale or color images, frames first.
+        texts: Text to draw on each image.
+    """
+    images = images.copy()
+    texts = array([str(text) for text in texts])
+    image_height, image_width = images.shape[1:3]
+    for text in unique(texts):
+        label = render_text(str(text))
+        label = label[:image_height, max(0, label.shape[1] - image_width) :]
+        height, width = label.shape
+        if images.ndim == 4:
+            label = label[..., None]
+        images[texts == text, :height, image_width - width :] = label
+    return images
+
+
+def overlay_all(
+    images: ImgLike,
+    overlays: ImgBool | Img,
+    color: tuple[int, int, int] = RED,
+    alpha: float = 0.3,
+) -> Img:
+    """Color any number of grayscale images given overlays, all at once.
+
+    Equivalent to `overlay` on each grayscale image and overlay, broadcasting leading
+    dimensions. Returns color images with channels last.
+
+    Args:
+        images: Grayscale images.
+        overlays: Grayscale overlays.
+        color: Color for the overlays.
+        alpha: Alpha value for the overlays. Range: 0-1
+    """
+    overlays = asarray(overlays)[..., None]
+    background = asarray(images, dtype=float)[..., None]
+    objects = rint(array(WHITE3) + overlays * (array(color) - array(WHITE3)) / WHITE)
+    mask = invert((overlays * alpha).astype(uint8)).astype(float)
+    return rint((background * mask + objects * (WHITE - mask)) / WHITE).astype(uint8)
@@ -1,12 +1,18 @@
 """Process images with OpenCV."""
 
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import cache
 
 from cv2 import (
     ADAPTIVE_THRESH_MEAN_C,
     BORDER_CONSTANT,
+    CC_STAT_AREA,
+    CC_STAT_HEIGHT,
+    CC_STAT_LEFT,
+    CC_STAT_TOP,
+    CC_STAT_WIDTH,
     CHAIN_APPROX_NONE,
     FILLED,
     FLOODFILL_MASK_ONLY,
@@ -27,6 +33,8 @@ from cv2 import (
     adaptiveThreshold,
     add,
     bitwise_not,
+    connectedComponents,
+    connectedComponentsWithStats,
     copyMakeBorder,
     createLineSegmentDetector,
     cvtColor,
@@ -37,12 +45,35 @@ from cv2 import (
     getStructuringElement,
     morphologyEx,
 )
-from numpy import array, flip, fliplr, iinfo, zeros_like
+from numpy import (
+    array,
+    ceil,
+    concatenate,
+    cumsum,
+    empty,
+    flip,
+    fliplr,
+    float32,
+    iinfo,
+    int32,
+    int64,
+    isin,
+    packbits,
+    uint8,
+    uint32,
+    zeros,
+    zeros_like,
+)
+from numpy import pad as pad_array
+from numpy.typing import DTypeLike
 
 from boilercv.colors import WHITE, WHITE3
-from boilercv.images import unpad
+from boilercv.images import scale_bool, unpad
 from boilercv.types import ArrFloat, ArrInt, Img, ImgBool
 
+BLOCK_SIZE = 11
+"""Default size of blocks about each pixel for adaptive thresholds."""
+
 
 def convert_image(img: Img, code: int | None = None) -> Img:
     """Convert image format, handling inconsistent type annotations."""
@@ -82,7 +113,9 @@ def pad(img: Img, pad_width: int, value: int) -> Img:
     )
 
 
-def binarize(img: Img, block_size: int = 11, thresh_dist_from_mean: int = 2) -> ImgBool:
+def binarize(
+    img: Img, block_size: int = BLOCK_SIZE, thresh_dist_from_mean: float = 2
+) -> ImgBool:
     """Binarize an image with an adaptive threshold."""
     block_size += 1 if block_size % 2 == 0 else 0
     return adaptiveThreshold(
@@ -95,6 +128,50 @@ def binarize(img: Img, block_size: int = 11, thresh_dist_from_mean: int = 2) ->
     ).astype(bool)
 
 
+def binarize_video(
+    video: Img,
+    block_size: int = BLOCK_SIZE,
+    thresh_dist_from_mean: float = 2,
+    out: Img | None = None,
+    chunk_size: int = 64,
+) -> Img:
+    """Binarize a video with an adaptive threshold, packing bits along the last axis.
+
+    Equivalent to `binarize` on each frame followed by `numpy.packbits`, but the local
+    mean is found from integral images of whole chunks of frames at once. Packed bits
+    are written to `out` if given, with shape `(frame, y, ceil(x / 8))`.
+    """
+    block_size += 1 if block_size % 2 == 0 else 0
+    frames, height, width = video.shape
+    out = empty((frames, height, -(-width // 8)), uint8) if out is None else out
+    radius, area = block_size // 2, block_size**2
+    # Offset from the mean that OpenCV rounds up to an integer for binary thresholds
+    offset = int(ceil(thresh_dist_from_mean))
+    for start in range(0, frames, chunk_size):
+        chunk = video[start : start + chunk_size]
+        # Integral images with a leading row and column of zeros. Edges are replicated
+        # as in OpenCV. Sums may wrap around, but differences of them are still exact.
+        integral = zeros(
+            (len(chunk), height + 2 * radius + 1, width + 2 * radius + 1), uint32
+        )
+        integral[:, 1:, 1:] = pad_array(
+            chunk, ((0, 0), (radius, radius), (radius, radius)), mode="edge"
+        )
+        integral.cumsum(axis=1, out=integral)
+        integral.cumsum(axis=2, out=integral)
+        b = block_size
+        sums = (
+            integral[:, b:, b:]
+            - integral[:, :-b, b:]
+            - integral[:, b:, :-b]
+            + integral[:, :-b, :-b]
+        ).view(int32)
+        # Round to the nearest integer mean. Blocks are odd, so there are no ties.
+        mean = (2 * sums + area) // (2 * area)
+        out[start : start + chunk_size] = packbits(mean - offset < chunk, axis=-1)
+    return out
+
+
 def flood(img: Img) -> ImgBool:
     """Flood the image, returning the resulting flood as a bright mask."""
     seed_point = array(img.shape) // 2
@@ -114,12 +191,12 @@ def flood(img: Img) -> ImgBool:
 
 
 def close_and_erode(img: Img) -> Img:
-    """Close holes, then erode."""
+    """Close holes, then erode an image or each frame of a video."""
     return transform(img, [Transform(Op.close, 4), Transform(Op.erode, 9)]).astype(bool)
 
 
 def get_wall(roi: Img) -> Img:
-    """Dilate the ROI to get the wall."""
+    """Dilate the ROI, or each frame of a video of ROIs, to get the wall."""
     return transform(roi, Transform(Op.dilate, 9)).astype(bool)
 
 
@@ -149,19 +226,78 @@ class Transform:
     """The elliptical kernel size."""
 
 
-def transform(img: Img, transforms: Transform | Sequence[Transform]) -> Img:
-    """Apply morphological transforms to an image with a dark background."""
-    transforms = [transforms] if isinstance(transforms, Transform) else transforms
-    pad_width = max(transform.size for transform in transforms)
-    # Explicitly pad out the image since cv2.morphologyEx boundary handling is weird
-    img = pad(img, pad_width, value=0)
-    for transform in transforms:
-        img = morphologyEx(  # pyright: ignore[reportAssignmentType]
-            src=img,
-            op=transform.op.value,
-            kernel=getStructuringElement(MORPH_ELLIPSE, [transform.size] * 2),
+@cache
+def get_kernel(size: int) -> Img:
+    """Get an elliptical kernel of a certain size, built once per size."""
+    kernel = getStructuringElement(MORPH_ELLIPSE, [size] * 2)
+    kernel.flags.writeable = False
+    return kernel  # pyright: ignore[reportReturnType]
+
+
+@dataclass
+class Morphology:
+    """Morphological transforms of images of a certain shape, reusing padded buffers.
+
+    Each image is copied into a zero-padded buffer, transformed back and forth between
+    two buffers, then copied out, so nothing is allocated per image.
+    """
+
+    transforms: Sequence[Transform]
+    """Transforms to apply in order."""
+    shape: tuple[int, ...]
+    """Shape of images to transform."""
+    dtype: DTypeLike = uint8
+    """Data type of images to transform."""
+    pad_width: int = field(init=False)
+    """Width of the pad about each image."""
+    buffers: tuple[Img, Img] = field(init=False, repr=False)
+    """Padded buffers to transform images in."""
+
+    def __post_init__(self):
+        self.pad_width = max(transform.size for transform in self.transforms)
+        padded_shape = tuple(dim + 2 * self.pad_width for dim in self.shape)
+        self.buffers = (
+            zeros(padded_shape, self.dtype),
+            zeros(padded_shape, self.dtype),
         )
-    return unpad(img, pad_width)
+
+    def __call__(self, img: Img, out: Img | None = None) -> Img:
+        """Transform an image, writing to `out` if given."""
+        src, dst = self.buffers
+        p = self.pad_width
+        # Explicitly pad out the image since cv2.morphologyEx boundary handling is
+        # weird, clearing the pad since transforms also write to it
+        src[:p], src[-p:], src[:, :p], src[:, -p:] = 0, 0, 0, 0
+        src[p:-p, p:-p] = img
+        for transform in self.transforms:
+            morphologyEx(
+                src=src,
+                op=transform.op.value,
+                kernel=get_kernel(transform.size),
+                dst=dst,
+            )
+            src, dst = dst, src
+        out = empty(self.shape, self.dtype) if out is None else out
+        out[...] = unpad(src, p)
+        return out
+
+
+def transform(
+    img: Img, transforms: Transform | Sequence[Transform], out: Img | None = None
+) -> Img:
+    """Apply morphological transforms to an image or video with a dark background.
+
+    Frames of a video are transformed in turn through the same buffers. Pass `out` to
+    write to a preallocated array.
+    """
+    transforms = [transforms] if isinstance(transforms, Transform) else transforms
+    morphology = Morphology(transforms, img.shape[-2:], img.dtype)
+    if img.ndim == 2:
+        return morphology(img, out)
+    out = empty(img.shape, img.dtype) if out is None else out
+    for frame, frame_out in zip(img, out, strict=True):
+        morphology(frame, frame_out)
+    return out
 
 
 def build_mask_from_polygons(img: Img, contours: Sequence[ArrInt]) -> Img:
@@ -176,6 +312,36 @@ def build_mask_from_polygons(img: Img, contours: Sequence[ArrInt]) -> Img:
     )
 
 
+def fill_holes(img: Img) -> Img:
+    """Fill holes in bright objects, such as those left by glare in bubbles.
+
+    Holes are regions of the dark background that don't reach the edge of the image.
+    """
+    img = img.astype(bool)
+    # Background regions only touch diagonally across bright objects, so connect them
+    # orthogonally, complementing the diagonal connectivity of objects
+    _count, labels = connectedComponents((~img).astype(uint8), connectivity=4)
+    edges = [labels[0, :], labels[-1, :], labels[:, 0], labels[:, -1]]
+    background = isin(labels, [label for edge in edges for label in edge])
+    return scale_bool(~background & (labels > 0) | img)
+
+
+def find_components(img: Img, connectivity: int = 8) -> tuple[ArrInt, ArrFloat]:
+    """Find connected components of bright objects in an image.
+
+    Returns stats of each component as rows of bounding box top, left, height, and
+    width, and area, all in pixels. Also returns centroids of each component as rows of
+    `(y, x)` pairs. The background is excluded.
+    """
+    _count, _labels, stats, centroids = connectedComponentsWithStats(
+        image=img, connectivity=connectivity
+    )
+    # The background is labeled first. OpenCV orders stats as (left, top, width, height,
+    # area) and centroids as (x, y).
+    order = [CC_STAT_TOP, CC_STAT_LEFT, CC_STAT_HEIGHT, CC_STAT_WIDTH, CC_STAT_AREA]
+    return stats[1:, order], fliplr(centroids[1:])  # pyright: ignore[reportReturnType]
+
+
 def find_contours(img: Img, method: int = CHAIN_APPROX_NONE) -> list[ArrInt]:
     """Find external contours of bright objects in an image."""
     contours, _hierarchy = findContours(
@@ -213,10 +379,43 @@ def draw_contours(
     )
 
 
-def find_line_segments(img: Img) -> tuple[ArrFloat, LineSegmentDetector]:
-    """Find line segments in an image."""
-    lsd = createLineSegmentDetector()
+@cache
+def get_line_segment_detector() -> LineSegmentDetector:
+    """Get a line segment detector, created once and reused across calls."""
+    return createLineSegmentDetector()
+
+
+def find_line_segments(
+    img: Img, lsd: LineSegmentDetector | None = None
+) -> tuple[ArrFloat, LineSegmentDetector]:
+    """Find line segments in an image, as rows of `(y0, x0, y1, x1)`.
+
+    The order of coordinates matches the dims of images, as for contours.
+    """
+    lsd = lsd or get_line_segment_detector()
     lines, *_ = lsd.detect(img)
-    # OpenCV returns line segments as shape (N, 1, 4) instead of (N, 4)
-    lines = lines.reshape(-1, 4)
+    # OpenCV returns line segments as shape (N, 1, 4) instead of (N, 4), or `None` if
+    # there are none. Flip the order of each pair from (x, y) to (y, x).
+    lines = (
+        empty((0, 4), dtype=float32)
+        if lines is None
+        else lines.reshape(-1, 4)[:, [1, 0, 3, 2]]
+    )
     return lines, lsd  # pyright: ignore[reportReturnType]
+
+
+def find_video_line_segments(
+    video: Img, lsd: LineSegmentDetector | None = None
+) -> tuple[ArrFloat, ArrInt]:
+    """Find line segments in each frame of a video, as one flat array.
+
+    Returns line segments of all frames as rows of `(y0, x0, y1, x1)`, as from
+    `find_line_segments`. Also returns frame offsets, so that the line segments of
+    frame `i` are `lines[offsets[i] : offsets[i + 1]]`.
+    """
+    lsd = lsd or get_line_segment_detector()
+    frames = [find_line_segments(img, lsd)[0] for img in video]
+    offsets = zeros(len(frames) + 1, dtype=int64)
+    cumsum([len(lines) for lines in frames], out=offsets[1:])
+    lines = concatenate([empty((0, 4), dtype=float32), *frames])
+    return lines, offsets  # pyright: ignore[reportReturnType]
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
 from contextlib import suppress
+from copy import deepcopy
 from dataclasses import dataclass, field
-from functools import partial
+from functools import partial, wraps
+from inspect import signature
 from itertools import chain
 from typing import Any, ClassVar, Generic, Self, get_args
 
@@ -29,6 +31,7 @@ from boilercv.pipelines.types import (
     K,
     LiteralGenericAlias,
     Mode,
+    Ps,
     T,
     UnionGenericAlias,
     V,
@@ -36,6 +39,8 @@ from boilercv.pipelines.types import (
 
 PIPELINE = "pipeline"
 """Pipe model context key."""
+CONTEXTS: dict[Hashable, PipelineCtx] = {}
+"""Composed contexts memoized by {func}`cache_context`."""
 
 
 class PipelineBase(ContextBase):
@@ -255,6 +260,48 @@ def set_defaults(i: dict[K, V], d: Defaults[K, V]) -> dict[K, V]:
     return i
 
 
+def cache_context(f: Callable[Ps, PipelineCtx]) -> Callable[Ps, PipelineCtx]:
+    """Memoize a context getter on its model class and arguments.
+
+    Arguments are bound to the signature of the getter with defaults applied, so that
+    equivalent calls share a key. Iterable arguments other than strings and mappings
+    are keyed as tuples. Calls with unhashable arguments, e.g. other contexts, are
+    composed without memoization. Memoized contexts are deep-copied on each call so
+    that callers can't mutate them. Call {func}`clear_context_cache` to invalidate
+    memoized contexts.
+    """
+    sig = signature(f)
+
+    @wraps(f)
+    def get_cached_context(*args: Ps.args, **kwds: Ps.kwargs) -> PipelineCtx:
+        bound = sig.bind(*args, **kwds)
+        bound.apply_defaults()
+        for name, arg in bound.arguments.items():
+            bound.arguments[name] = freeze(arg)
+        key = (f, bound.args, tuple(sorted(bound.kwargs.items())))
+        try:
+            context = CONTEXTS.get(key)
+        except TypeError:
+            return f(*bound.args, **bound.kwargs)
+        if context is None:
+            context = CONTEXTS[key] = f(*bound.args, **bound.kwargs)
+        return deepcopy(context)
+
+    return get_cached_context
+
+
+def freeze(arg: Any) -> Any:
+    """Freeze iterable arguments to tuples so they may be hashed."""
+    if isinstance(arg, str | bytes | type | Mapping | BaseModel):
+        return arg
+    return tuple(arg) if isinstance(arg, Iterable) else arg
+
+
+def clear_context_cache():
+    """Clear contexts memoized by {func}`cache_context`."""
+    CONTEXTS.clear()
+
+
 def compose_contexts(*contexts: PipelineCtx) -> PipelineCtx:
     """Compose contexts."""
     context = PipelineCtx()
@@ -2,6 +2,7 @@
 
 from typing import (
     Literal,
+    ParamSpec,
     TypeAlias,
     TypeVar,
     _LiteralGenericAlias,  # pyright: ignore[reportAttributeAccessIssue]
@@ -20,3 +21,5 @@ K = TypeVar("K")
 """Key type."""
 V = TypeVar("V")
 """Value type."""
+Ps = ParamSpec("Ps")
+"""Parameter type specification."""
@@ -0,0 +1,70 @@
+"""Test image processing with OpenCV."""
+
+import pytest
+from numpy import array_equal, packbits, stack, uint8, zeros
+from numpy.random import default_rng
+
+from boilercv.data import FRAME, XPX, YPX
+from boilercv.data.frames import frame_lines
+from boilercv.images.cv import (
+    binarize,
+    binarize_video,
+    find_line_segments,
+    find_video_line_segments,
+)
+
+RNG = default_rng(0)
+"""Random number generator."""
+
+
+@pytest.mark.parametrize(
+    ("width", "block_size", "thresh_dist_from_mean", "chunk_size"),
+    [
+        (32, 11, 2, 64),
+        (29, 11, 2, 64),
+        (29, 10, 2, 64),
+        (29, 11, 1.5, 64),
+        (29, 11, -0.5, 64),
+        (29, 11, 2, 2),
+        (29, 11, 2, 3),
+        (13, 31, 2, 64),
+    ],
+)
+def test_binarize_video(width, block_size, thresh_dist_from_mean, chunk_size):
+    """Binarizing a video is bit-identical to binarizing and packing each frame."""
+    video = RNG.integers(0, 256, (5, 23, width), dtype=uint8)
+    video[:, 5:15, 5:15] //= 4
+    assert array_equal(
+        binarize_video(video, block_size, thresh_dist_from_mean, chunk_size=chunk_size),
+        packbits(
+            stack([
+                binarize(frame, block_size, thresh_dist_from_mean) for frame in video
+            ]),
+            axis=-1,
+        ),
+    )
+
+
+def test_find_line_segments():
+    """Line segments are found as rows of `(y0, x0, y1, x1)`, like image dims."""
+    img = zeros((40, 64), uint8)
+    img[18:22, 10:50] = 255
+    lines, _ = find_line_segments(img)
+    df = frame_lines(lines)
+    assert len(df)
+    assert ((df[YPX] > 17) & (df[YPX] < 23)).all(axis=None)
+    assert (abs(df[XPX][1] - df[XPX][0]) > 30).all()
+
+
+def test_find_video_line_segments():
+    """Line segments in videos are those found in each frame, in the same order."""
+    video = zeros((3, 40, 64), uint8)
+    video[0, 18:22, 10:50] = 255
+    video[2, 5:35, 30:34] = 255
+    lines, offsets = find_video_line_segments(video)
+    for i, img in enumerate(video):
+        assert array_equal(
+            lines[offsets[i] : offsets[i + 1]], find_line_segments(img)[0]
+        )
+    df = frame_lines(lines, offsets)
+    assert df.index.get_level_values(FRAME).unique().tolist() == [0, 2]
@@ -0,0 +1,70 @@
+"""Test finding objects."""
+
+import pytest
+from boilercv_pipeline.stages.find_objects import C, get_components
+from cv2 import circle
+from numpy import arange, full, stack, uint8
+from numpy.testing import assert_allclose
+from shapely import LinearRing, Polygon
+from xarray import DataArray
+
+from boilercv.colors import BLACK, WHITE
+from boilercv.data import DIMS
+from boilercv.images.cv import fill_holes, find_contours
+from boilercv.types import ImgBool
+
+OFFSETS = (8, 16)
+"""Pixel coordinates of the top-left pixel of cropped videos."""
+OBJECTS = [[((15, 15), 6), ((40, 30), 10)], [((45, 20), 8), ((12, 45), 4)]]
+"""Centers `(x, y)` and radii of objects in each frame."""
+HOLES = [((40, 30), 3), ((45, 20), 2)]
+"""Centers `(x, y)` and radii of holes in objects."""
+
+
+def get_frame(objects: list[tuple[tuple[int, int], int]]) -> ImgBool:
+    """Get a binarized frame of dark, circular objects on a bright background."""
+    frame = full((60, 64), WHITE, uint8)
+    for center, radius in objects:
+        circle(frame, center, radius, BLACK, thickness=-1)
+    for center, radius in HOLES:
+        if not frame[center[::-1]]:
+            circle(frame, center, radius, WHITE, thickness=-1)
+    return frame.astype(bool)
+
+
+@pytest.fixture
+def video() -> DataArray:
+    """Get a cropped, binarized video of dark objects, some with holes."""
+    values = stack([get_frame(objects) for objects in OBJECTS])
+    return DataArray(
+        values,
+        coords={
+            dim: offset + arange(size)
+            for dim, offset, size in zip(DIMS, (0, *OFFSETS), values.shape, strict=True)
+        },
+        dims=DIMS,
+    )
+
+
+def test_get_components(video):
+    """Components match areas and centroids of objects bounded by their contours.
+
+    Contours pass through the centers of pixels at the edges of objects, so pixel
+    areas exceed the areas bounded by contours by half of the contour points, plus one.
+    """
+    components = get_components(video).sort_values([C.frame(), C.y(), C.x()])
+    for frame, img in zip(video.frame.values, video.values, strict=True):
+        objects = components[components[C.frame()] == frame]
+        contours = sorted(
+            (contour + OFFSETS for contour in find_contours(fill_holes(~img))),
+            key=lambda contour: tuple(LinearRing(contour).centroid.coords[0]),
+        )
+        assert len(objects) == len(contours)
+        assert_allclose(
+            objects[C.area()],
+            [Polygon(contour).area + len(contour) / 2 + 1 for contour in contours],
+        )
+        assert_allclose(
+            objects[[C.y(), C.x()]],
+            [LinearRing(contour).centroid.coords[0] for contour in contours],
+        )
@@ -0,0 +1,82 @@
+"""Test multi-start model fits."""
+
+import pytest
+from boilercore.models.fit import Fit
+from boilercv_pipeline import fits
+from boilercv_pipeline.fits import fit_multistart, hash_fit, is_importable
+from numpy import linspace
+
+SCALE = 1.0
+"""Scale of the model, referred to by the model like a notebook-level constant."""
+X = linspace(1, 2)
+"""Independent variable."""
+Y = 0.5 * X
+"""Dependent variable."""
+GUESSES = [0.1, 0.4, 0.9]
+"""Initial guesses."""
+PARAMS = Fit(independent_params=["x"], free_params=["a"])
+"""Fit parameters."""
+
+
+def model(x, a):
+    """Model a line."""
+    return SCALE * a * x
+
+
+@pytest.fixture
+def fitted(monkeypatch) -> list[dict[str, float]]:
+    """Fit each guess to itself, recording the guesses fit."""
+    fitted: list[dict[str, float]] = []
+
+    def fit(_model, _fixed_values, free_params, guesses, **_kwds):
+        fitted.append(guesses)
+        return [guesses[param] for param in free_params], [0.0] * len(free_params)
+
+    monkeypatch.setattr(fits, "fit", fit)
+    return fitted
+
+
+def test_fit_multistart_best(fitted):
+    """The fit with the least sum of squared residuals is kept."""
+    best_fits, errors = fit_multistart(
+        model, PARAMS, X, Y, guesses=GUESSES, cache=None, max_workers=1
+    )
+    assert len(fitted) == len(GUESSES)
+    assert best_fits == {"a": 0.4}
+    assert errors == {"a_err": 0.0}
+
+
+def test_fit_multistart_cached(fitted, tmp_path):
+    """Unchanged fits are loaded from the cache rather than refit."""
+    first = fit_multistart(
+        model, PARAMS, X, Y, guesses=GUESSES, cache=tmp_path, max_workers=1
+    )
+    fitted.clear()
+    assert (
+        fit_multistart(
+            model, PARAMS, X, Y, guesses=GUESSES, cache=tmp_path, max_workers=1
+        )
+        == first
+    )
+    assert not fitted
+
+
+def test_fit_multistart_not_importable(fitted):
+    """Models that can't be imported by worker processes are fit in-process."""
+
+    def local_model(x, a):
+        return a * x
+
+    assert not is_importable(local_model)
+    fit_multistart(local_model, PARAMS, X, Y, guesses=GUESSES, cache=None)
+    assert len(fitted) == len(GUESSES)
+
+
+def test_hash_fit(monkeypatch):
+    """Fits are keyed by model constants, guesses, and data."""
+    key = hash_fit(model, PARAMS, GUESSES, X, Y)
+    assert hash_fit(model, PARAMS, list(GUESSES), X.copy(), Y.copy()) == key
+    assert hash_fit(model, PARAMS, GUESSES[:-1], X, Y) != key
+    assert hash_fit(model, PARAMS, GUESSES, X, 2 * Y) != key
+    monkeypatch.setitem(globals(), "SCALE", 2.0)
+    assert hash_fit(model, PARAMS, GUESSES, X, Y) != key
@@ -0,0 +1,40 @@
+"""Test image processing."""
+
+import pytest
+from numpy import array_equal, stack, uint8
+from numpy.random import default_rng
+
+from boilercv.colors import BLUE, RED
+from boilercv.images import draw_text, draw_texts, overlay, overlay_all
+
+RNG = default_rng(0)
+"""Random number generator."""
+IMAGES = RNG.integers(0, 256, (4, 40, 90), dtype=uint8)
+"""Grayscale images, narrower than some labels."""
+TEXTS = ["0", "1", "0", "1000000"]
+"""Labels for each image, some shared and some wider than the images."""
+
+
+@pytest.mark.parametrize("images", [IMAGES, stack([IMAGES] * 3, axis=-1)])
+def test_draw_texts(images):
+    """Drawing text on a stack of images matches drawing it on each image."""
+    assert array_equal(
+        draw_texts(images, TEXTS),
+        stack([
+            draw_text(image, text) for image, text in zip(images, TEXTS, strict=True)
+        ]),
+    )
+
+
+@pytest.mark.parametrize("color", [RED, BLUE])
+@pytest.mark.parametrize("alpha", [0.3, 0.5, 1.0])
+def test_overlay_all(color, alpha):
+    """Overlaying a stack of images matches overlaying each image."""
+    overlays = RNG.integers(0, 2, IMAGES.shape, dtype=uint8) * 255
+    assert array_equal(
+        overlay_all(IMAGES, overlays, color, alpha)[..., :3],
+        stack([
+            overlay(image, image_overlay, color, alpha)[..., :3]
+            for image, image_overlay in zip(IMAGES, overlays, strict=True)
+        ]),
+    )
@@ -0,0 +1,76 @@
+"""Test notebook operations."""
+
+from json import dumps
+
+import pytest
+from boilercv_pipeline import nbs
+from boilercv_pipeline.nbs import PARAMETERS_TAG, compile_nb, exec_nb
+
+
+def get_nb(*sources: str, tags: tuple[str, ...] = ()) -> str:
+    """Get a notebook of code cells, with tags on the first cell."""
+    return dumps({
+        "cells": [
+            {
+                "cell_type": "code",
+                "metadata": {"tags": list(tags) if i == 0 else []},
+                "source": source,
+            }
+            for i, source in enumerate(sources)
+        ]
+    })
+
+
+@pytest.fixture(autouse=True)
+def nb_cache(monkeypatch, tmp_path):
+    """Compile notebooks into a temporary cache, clearing the in-memory cache."""
+    monkeypatch.setattr(nbs, "NB_CACHE", tmp_path)
+    compile_nb.cache_clear()
+    yield tmp_path
+    compile_nb.cache_clear()
+
+
+def test_exec_nb():
+    """Parameters are injected below the parameters cell."""
+    nb = get_nb("x = 1", "y = x + 1", tags=(PARAMETERS_TAG,))
+    assert exec_nb(nb, params={"x": 2}).y == 3
+
+
+def test_compile_nb_cached(nb_cache):
+    """Compiled notebooks are loaded from the cache."""
+    nb = get_nb("x = 1")
+    compile_nb(nb)
+    compile_nb.cache_clear()
+    (cached,) = nb_cache.iterdir()
+    cached.write_bytes(nbs.marshal_dumps([(compile("x = 2", "", "exec"), ())]))
+    assert exec_nb(nb).x == 2
+
+
+def test_compile_nb_invalidated(nb_cache):
+    """Changed notebooks are recompiled, not loaded from the cache."""
+    assert exec_nb(get_nb("x = 1")).x == 1
+    compile_nb.cache_clear()
+    assert exec_nb(get_nb("x = 2")).x == 2
+    assert len(list(nb_cache.iterdir())) == 2
+
+
+def test_compile_nb_compiler_changed(monkeypatch, nb_cache):
+    """Notebooks are recompiled, not loaded from the cache, when the compiler changes."""
+    nb = get_nb("x = 1")
+    compile_nb(nb)
+    compile_nb.cache_clear()
+    monkeypatch.setattr(nbs, "COMPILER_HASH", "changed")
+    assert exec_nb(nb).x == 1
+    assert len(list(nb_cache.iterdir())) == 2
+
+
+@pytest.mark.parametrize("source", ["%time x = 1", "!echo", "%%time\nx = 1"])
+def test_compile_nb_magics(source):
+    """Magics and shell commands are rejected at compile time."""
+    with pytest.raises(ValueError, match="outside of IPython"):
+        compile_nb(get_nb(source))
+
+
+def test_compile_nb_get_ipython():
+    """Calls to the IPython shell in source aren't mistaken for magics."""
+    compile_nb(get_nb("from IPython import get_ipython\nshell = get_ipython()"))
@@ -0,0 +1,56 @@
+"""Test packing and unpacking of binarized videos."""
+
+import pytest
+from boilercv_pipeline.images import get_bounding_slices
+from numpy import arange, zeros
+from numpy.random import default_rng
+from numpy.testing import assert_array_equal
+from xarray import DataArray
+
+from boilercv.data import DIMS, FRAME, VIDEO, XPX, YPX
+from boilercv.data.packing import BITS, pack, unpack
+
+RNG = default_rng(0)
+"""Random number generator."""
+SHAPE = (3, 20, 50)
+"""Shape of videos, with frames narrower than a whole number of bytes."""
+
+
+@pytest.fixture
+def video() -> DataArray:
+    """Get a binarized video with pixel coordinates."""
+    return DataArray(
+        RNG.integers(0, 2, SHAPE).astype(bool),
+        coords={dim: arange(size) for dim, size in zip(DIMS, SHAPE, strict=True)},
+        dims=DIMS,
+        name=VIDEO,
+    )
+
+
+@pytest.mark.parametrize(("left", "right"), [(11, 29), (16, 24), (3, 45), (0, 50)])
+def test_get_bounding_slices_col_multiple(left, right):
+    """Columns are rounded out to multiples from the left, within the image."""
+    roi = zeros(SHAPE[1:], bool)
+    roi[5:10, left:right] = True
+    rows, cols = get_bounding_slices(roi, pad_width=2, col_multiple=BITS)
+    assert rows == slice(3, 12)
+    assert cols.start % BITS == 0
+    assert cols.start <= left - 2 or cols.start == 0
+    assert cols.stop >= min(right + 2, SHAPE[-1])
+    assert (cols.stop - cols.start) % BITS == 0 or cols.stop == SHAPE[-1]
+
+
+@pytest.mark.parametrize(("left", "right"), [(11, 29), (16, 24), (3, 37)])
+def test_unpack_cropped(video, left, right):
+    """Packing and unpacking videos cropped to whole bytes keeps shape and coords."""
+    roi = zeros(SHAPE[1:], bool)
+    roi[5:10, left:right] = True
+    cropped = video.isel(
+        dict(zip((YPX, XPX), get_bounding_slices(roi, col_multiple=BITS), strict=True))
+    )
+    unpacked = unpack(pack(cropped))
+    assert unpacked.dims == cropped.dims
+    assert unpacked.shape == cropped.shape
+    for dim in (FRAME, YPX, XPX):
+        assert_array_equal(unpacked[dim], cropped[dim])
+    assert_array_equal(unpacked, cropped)
@@ -0,0 +1,56 @@
+"""Test pipelines."""
+
+from typing import get_args
+
+import pytest
+
+from boilercv.correlations.models import Equations, Forms, Metadata
+from boilercv.correlations.types import AnyExpr, Sym
+from boilercv.pipelines import CONTEXTS, clear_context_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_context_cache():
+    """Clear memoized contexts before and after each test."""
+    clear_context_cache()
+    yield
+    clear_context_cache()
+
+
+def test_cache_context():
+    """Contexts are composed once per model and arguments."""
+    first = Equations[AnyExpr].get_context(symbols=iter(get_args(Sym)))
+    cached = len(CONTEXTS)
+    second = Equations[AnyExpr].get_context(symbols=list(get_args(Sym)))
+    assert len(CONTEXTS) == cached
+    assert first is not second
+    assert dict(first) == dict(second)
+
+
+def test_cache_context_defaults():
+    """Calls equivalent under the signature of the getter share memoized contexts."""
+    Equations[AnyExpr].get_context()
+    cached = len(CONTEXTS)
+    Equations[AnyExpr].get_context(symbols=None)
+    Equations[AnyExpr].get_context(None, None)
+    assert len(CONTEXTS) == cached
+
+
+def test_cache_context_copies():
+    """Mutating a returned context doesn't mutate the memoized context."""
+    Metadata.get_context().pipelines.clear()
+    assert Metadata.get_context().pipelines
+
+
+def test_cache_context_unhashable():
+    """Contexts composed from other contexts are not memoized."""
+    Equations[AnyExpr].get_context(forms_context=Forms.get_context())
+    assert all(args == (Forms,) for _f, args, _kwds in CONTEXTS)
+
+
+def test_clear_context_cache():
+    """Clearing the cache invalidates memoized contexts."""
+    Forms.get_context()
+    assert CONTEXTS
+    clear_context_cache()
+    assert not CONTEXTS
@@ -0,0 +1,38 @@
+"""Test plotting."""
+
+from boilercv_pipeline.plotting import rasterize_points
+from numpy import array_equal
+
+EXTENT = (0.0, 4.0, 1.0, 3.0)
+"""Extent of rasterized points as left, right, bottom, and top."""
+SHAPE = (2, 4)
+"""Shape of rasterized images."""
+
+
+def test_rasterize_points_edges():
+    """Points on every edge of the extent are kept, and those outside are dropped."""
+    counts, cats = rasterize_points(
+        x=[0, 4, 0, 4, 2, -1, 5, 2],
+        y=[3, 3, 1, 1, 2, 2, 2, 0],
+        extent=EXTENT,
+        shape=SHAPE,
+        categories=[1, 2, 3, 4, 5, 6, 7, 8],
+    )
+    assert array_equal(counts, [[1, 0, 0, 1], [1, 0, 1, 1]])
+    assert array_equal(cats, [[1, -1, -1, 2], [3, -1, 5, 4]])
+
+
+def test_rasterize_points_log_edges():
+    """Points on the edges of log-scaled extents are kept."""
+    counts, _ = rasterize_points(
+        x=[0, 4, 2], y=[10, 1000, 0], extent=(0, 4, 10, 1000), shape=SHAPE, log=True
+    )
+    assert array_equal(counts, [[0, 0, 0, 1], [1, 0, 0, 0]])
+
+
+def test_rasterize_points_degenerate_extent():
+    """Points are kept in the first pixels along extents of zero width."""
+    counts, _ = rasterize_points(
+        x=[2, 2, 2, 3], y=[3, 1, 1, 2], extent=(2, 2, 1, 3), shape=SHAPE
+    )
+    assert array_equal(counts, [[1, 0, 0, 0], [2, 0, 0, 0]])
@@ -0,0 +1,80 @@
+"""Test previews."""
+
+import pytest
+from boilercv_pipeline.preview import (
+    fits,
+    get_preview_names,
+    pad_to,
+    update_previews,
+    write_previews,
+)
+from numpy import arange, array_equal, ones, uint8, zeros
+from xarray import open_dataset
+
+from boilercv.data import VIDEO, VIDEO_NAME
+
+
+@pytest.fixture
+def destination(tmp_path):
+    """Get a preview store of two videos, with tiles of the larger preview's size."""
+    destination = tmp_path / "preview.nc"
+    write_previews(
+        destination,
+        {"a": ones((2, 3), dtype=uint8), "b": 2 * ones((4, 4), dtype=uint8)},
+        stale_names=[],
+    )
+    return destination
+
+
+def get_previews(destination):
+    """Get previews from a store by video name."""
+    with open_dataset(destination, engine="h5netcdf") as ds:
+        return {
+            str(name): preview.values
+            for name, preview in zip(ds[VIDEO_NAME].values, ds[VIDEO], strict=True)
+        }
+
+
+def test_pad_to():
+    """Odd pads put the extra pixel at the bottom and right."""
+    padded = pad_to(ones((1, 2), dtype=uint8), (4, 5))
+    assert padded.shape == (4, 5)
+    assert array_equal(padded.nonzero(), ([1, 1], [1, 2]))
+
+
+def test_fits():
+    """Images fit tiles at least as large along every dimension."""
+    assert fits((2, 3), (2, 4))
+    assert not fits((3, 3), (2, 4))
+    assert not fits((2, 3, 3), (2, 4))
+
+
+def test_write_previews(destination):
+    """Previews are padded into tiles of the largest preview's size."""
+    previews = get_previews(destination)
+    assert get_preview_names(destination) == ["a", "b"]
+    assert previews["a"].shape == previews["b"].shape == (4, 4)
+    assert previews["a"].sum() == 6
+
+
+def test_update_previews(destination):
+    """Previews are appended, replaced, and dropped in place."""
+    c = arange(16, dtype=uint8).reshape(4, 4)
+    assert update_previews(
+        destination, {"b": zeros((3, 3), dtype=uint8), "c": c}, stale_names=["a"]
+    )
+    previews = get_previews(destination)
+    assert get_preview_names(destination) == ["c", "b"]
+    assert array_equal(previews["c"], c)
+    assert not previews["b"].any()
+
+
+def test_update_previews_not_fitting(destination):
+    """Previews not fitting the tiles of the store aren't updated in place."""
+    assert not update_previews(
+        destination, {"c": ones((5, 4), dtype=uint8)}, stale_names=[]
+    )
+    assert get_preview_names(destination) == ["a", "b"]
+    write_previews(destination, {"c": ones((5, 4), dtype=uint8)}, stale_names=[])
+    assert get_preview_names(destination) == ["c", "a", "b"]
+    assert get_previews(destination)["a"].shape == (5, 4)
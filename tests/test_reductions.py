@@ -0,0 +1,72 @@
+"""Test reductions of videos over frames."""
+
+import pytest
+from numpy import arange, array_equal, bincount, percentile, uint8, zeros
+from numpy.random import default_rng
+from numpy.testing import assert_allclose
+from xarray import DataArray
+
+from boilercv.data import DIMS, FRAME, TIME
+from boilercv.data.reductions import (
+    FIRST,
+    HISTOGRAM,
+    MAX,
+    MEAN,
+    MIN,
+    PERCENTILE,
+    get_stats,
+    percentile_frames,
+)
+
+RNG = default_rng(0)
+"""Random number generator."""
+SHAPE = (23, 6, 7)
+"""Shape of videos, with frames not a whole number of chunks."""
+PERCENTILES = [0, 1, 12.5, 50, 99, 100]
+"""Percentiles, including extremes and those between frames."""
+
+
+@pytest.fixture
+def video() -> DataArray:
+    """Get a video with time coordinates along frames."""
+    return DataArray(
+        RNG.integers(0, 256, SHAPE, dtype=uint8),
+        coords={
+            **{dim: arange(size) for dim, size in zip(DIMS, SHAPE, strict=True)},
+            TIME: (FRAME, 0.1 * arange(SHAPE[0])),
+        },
+        dims=DIMS,
+    )
+
+
+@pytest.mark.parametrize(("chunk_size", "step"), [(64, 1), (5, 1), (5, 3), (1, 2)])
+def test_get_stats(video, chunk_size, step):
+    """Statistics match those of the frames taken all at once."""
+    frames = video.values[::step]
+    stats = get_stats(video, PERCENTILES, chunk_size, step)
+    assert stats.attrs["num_frames"] == len(frames)
+    assert list(stats.attrs["shape"]) == list(SHAPE)
+    assert TIME not in stats.coords
+    assert array_equal(stats[FIRST], frames[0])
+    assert array_equal(stats[MIN], frames.min(axis=0))
+    assert array_equal(stats[MAX], frames.max(axis=0))
+    assert_allclose(stats[MEAN], frames.mean(axis=0))
+    assert array_equal(
+        stats[PERCENTILE],
+        percentile(frames, PERCENTILES, axis=0, method="inverted_cdf"),
+    )
+    assert array_equal(stats[HISTOGRAM], bincount(frames.ravel(), minlength=256))
+
+
+def test_percentile_frames(video):
+    """Percentiles of pixels over frames match NumPy's inverted CDF."""
+    assert array_equal(
+        percentile_frames(video, 30, chunk_size=4),
+        percentile(video.values, 30, axis=0, method="inverted_cdf"),
+    )
+
+
+def test_get_stats_no_frames():
+    """Videos with no frames have no statistics."""
+    with pytest.raises(ValueError, match="no frames"):
+        get_stats(DataArray(zeros((0, 2, 2), uint8), dims=DIMS))
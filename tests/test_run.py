@@ -0,0 +1,126 @@
+"""Test running pipeline stages."""
+
+from pathlib import Path
+
+import pytest
+from boilercv_pipeline.run.__main__ import ScheduledStage, Scheduler, sort_stages
+from pydantic import BaseModel
+
+VIDEOS = ["a", "b"]
+"""Names of videos."""
+
+
+class Paths(BaseModel):
+    """Stage deps or outs."""
+
+    first: Path | None = None
+    """First path."""
+    second: Path | None = None
+    """Second path."""
+
+
+class Params(BaseModel):
+    """Stage parameters."""
+
+    deps: Paths = Paths()
+    """Stage dependencies."""
+    outs: Paths = Paths()
+    """Stage outputs."""
+
+
+@pytest.fixture
+def stages(tmp_path) -> dict[str, ScheduledStage]:
+    """Stages converting videos and binarizing each, then finding tracks in all.
+
+    Stages are given out of order.
+    """
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    for name in VIDEOS:
+        (raw / f"{name}.cine").touch()
+    models = tmp_path / "models"
+    models.mkdir()
+    (models / "model.json").touch()
+    converted = tmp_path / "converted"
+    binarized = tmp_path / "binarized"
+    return {
+        "find_tracks": ScheduledStage(
+            name="find_tracks",
+            params=Params(  # pyright: ignore[reportArgumentType]
+                deps=Paths(first=binarized), outs=Paths(first=tmp_path / "tracks")
+            ),
+            per_video=False,
+        ),
+        "binarize": ScheduledStage(
+            name="binarize",
+            params=Params(  # pyright: ignore[reportArgumentType]
+                deps=Paths(first=models, second=converted), outs=Paths(first=binarized)
+            ),
+            per_video=True,
+            video_source="second",
+        ),
+        "convert": ScheduledStage(
+            name="convert",
+            params=Params(deps=Paths(first=raw), outs=Paths(first=converted)),  # pyright: ignore[reportArgumentType]
+            per_video=True,
+            video_source="first",
+        ),
+    }
+
+
+def test_sort_stages(stages):
+    """Stages are sorted after the stages producing their dependencies."""
+    sorted_stages = sort_stages(stages)
+    assert list(sorted_stages) == ["convert", "binarize", "find_tracks"]
+    assert sorted_stages["convert"].upstream == set()
+    assert sorted_stages["binarize"].upstream == {"convert"}
+    assert sorted_stages["find_tracks"].upstream == {"binarize"}
+
+
+def test_sort_stages_nested(stages, tmp_path):
+    """Stages depending on paths nested in the outputs of others are downstream."""
+    stages["find_tracks"].params.deps.second = tmp_path / "converted" / "a.nc"
+    assert sort_stages(stages)["find_tracks"].upstream == {"binarize", "convert"}
+
+
+def test_sort_stages_cycle(stages, tmp_path):
+    """Stages depending on each other in a cycle can't be sorted."""
+    stages["convert"].params.deps.second = tmp_path / "tracks"
+    with pytest.raises(ValueError, match="cycle"):
+        sort_stages(stages)
+
+
+def test_get_videos(stages, tmp_path):
+    """Videos come from the named video source, not the first directory dependency."""
+    converted = tmp_path / "converted"
+    converted.mkdir()
+    for name in VIDEOS:
+        (converted / f"{name}.nc").touch()
+    assert stages["binarize"].get_videos() == VIDEOS
+
+
+def test_get_videos_unnamed(stages):
+    """Per-video stages must name their video source."""
+    stages["binarize"].video_source = None
+    with pytest.raises(ValueError, match="video source"):
+        stages["binarize"].get_videos()
+
+
+def test_scheduler(stages):
+    """Videos stream through per-video stages before whole stages run."""
+    scheduler = Scheduler(sort_stages(stages))
+
+    def finish(*tasks):
+        scheduler.submitted.update(tasks)
+        scheduler.done.update(tasks)
+
+    assert scheduler.get_ready() == [("convert", "a"), ("convert", "b")]
+    finish(("convert", "a"))
+    scheduler.submitted.add(("convert", "b"))
+    assert scheduler.get_ready() == [("binarize", "a")]
+    finish(("binarize", "a"), ("convert", "b"))
+    assert scheduler.get_ready() == [("binarize", "b")]
+    finish(("binarize", "b"))
+    assert scheduler.get_ready() == [("find_tracks", None)]
+    finish(("find_tracks", None))
+    assert not scheduler.get_ready()
@@ -0,0 +1,103 @@
+"""Test datasets."""
+
+from os import utime
+
+import pytest
+from boilercv_pipeline.sets import (
+    Manifest,
+    get_imported_modules,
+    is_processed,
+    load_stats,
+    record_processed,
+)
+from numpy import arange, uint8
+from xarray import DataArray
+
+from boilercv.data import DIMS
+from boilercv.data.reductions import get_stats
+
+STAGE = "stage"
+"""Hash of a stage."""
+
+
+@pytest.fixture
+def paths(tmp_path):
+    """Get sources, destination, and manifest paths."""
+    sources = [tmp_path / "a.nc", tmp_path / "b.nc"]
+    for source in sources:
+        source.write_bytes(source.name.encode("utf-8"))
+    destination = tmp_path / "destination.nc"
+    destination.touch()
+    return sources, destination, tmp_path / "manifest.json"
+
+
+def test_is_processed(paths):
+    """Destinations recorded as processed from their sources are processed."""
+    sources, destination, manifest = paths
+    record_processed(destination, sources, STAGE, manifest)
+    assert is_processed(destination, sources, STAGE, manifest)
+
+
+def test_is_processed_missing_destination(paths):
+    """Missing destinations are unprocessed."""
+    sources, destination, manifest = paths
+    record_processed(destination, sources, STAGE, manifest)
+    destination.unlink()
+    assert not is_processed(destination, sources, STAGE, manifest)
+
+
+def test_is_processed_missing_manifest(paths):
+    """Destinations without a manifest are unprocessed, and stay without one."""
+    sources, destination, manifest = paths
+    assert not is_processed(destination, sources, STAGE, manifest)
+    assert not manifest.exists()
+
+
+def test_is_processed_changed_stage(paths):
+    """Destinations processed by a different stage are unprocessed."""
+    sources, destination, manifest = paths
+    record_processed(destination, sources, STAGE, manifest)
+    assert not is_processed(destination, sources, "other", manifest)
+
+
+def test_is_processed_changed_sources(paths):
+    """Destinations processed from different sources are unprocessed."""
+    sources, destination, manifest = paths
+    record_processed(destination, sources, STAGE, manifest)
+    assert not is_processed(destination, sources[:1], STAGE, manifest)
+    sources[0].write_bytes(b"changed")
+    assert not is_processed(destination, sources, STAGE, manifest)
+
+
+def test_is_processed_touched_sources(paths):
+    """Sources touched without changing their contents are rehashed and recorded."""
+    sources, destination, manifest = paths
+    record_processed(destination, sources, STAGE, manifest)
+    mtime_ns = sources[0].stat().st_mtime_ns + 10**9
+    utime(sources[0], ns=(mtime_ns, mtime_ns))
+    assert is_processed(destination, sources, STAGE, manifest)
+    recorded = Manifest.model_validate_json(manifest.read_text(encoding="utf-8"))
+    assert recorded.sources[0].mtime_ns == mtime_ns
+
+
+def test_get_imported_modules():
+    """First-party modules imported by a module are found transitively."""
+    modules = get_imported_modules(["boilercv.data.reductions"])
+    assert {"boilercv", "boilercv.data", "boilercv.types"} <= set(modules)
+    assert not any(name.startswith("numpy") for name in modules)
+
+
+def test_load_stats(tmp_path):
+    """Statistics written on conversion are loaded by video name."""
+    video = DataArray(arange(60, dtype=uint8).reshape(5, 3, 4), dims=DIMS)
+    stats = get_stats(video)
+    stats.to_netcdf(tmp_path / "video.nc")
+    loaded = load_stats("video", tmp_path)
+    assert loaded is not None
+    assert loaded.identical(stats.assign_attrs(shape=loaded.attrs["shape"]))
+    assert list(loaded.attrs["shape"]) == [5, 3, 4]
+
+
+def test_load_stats_missing(tmp_path):
+    """Videos without statistics have none to load."""
+    assert load_stats("video", tmp_path) is None
@@ -0,0 +1,66 @@
+"""Test syncing DVC configurations."""
+
+from pathlib import Path
+
+from boilercv_pipeline.sync_dvc import const
+from boilercv_pipeline.sync_dvc.__main__ import get_changed_stages, hash_stage
+from pydantic import BaseModel, create_model
+
+
+class Unchanged(BaseModel):
+    """Stage whose schema and parameters are unchanged between syncs."""
+
+    a: int = 0
+    """Parameter."""
+
+
+class Changed(BaseModel):
+    """Stage whose parameters change between syncs."""
+
+    b: int = 0
+    """Parameter."""
+
+
+STAGES = {"unchanged": Unchanged, "changed": Changed}
+
+
+def hash_stages(params):
+    return {name: hash_stage(model, params) for name, model in STAGES.items()}
+
+
+def test_sync_incremental():
+    """Only stages whose parameters changed since the last sync are regenerated."""
+    previous_hashes = hash_stages({const.table_key: {"a": 1, "b": 1}})
+    hashes = hash_stages({const.table_key: {"a": 1, "b": 2}})
+    changed = get_changed_stages(
+        STAGES, hashes, previous_hashes, existing_stages=STAGES, incremental=True
+    )
+    assert set(changed) == {"changed"}
+
+
+def test_sync_incremental_missing():
+    """Unchanged stages missing from the existing pipeline are regenerated."""
+    hashes = hash_stages({})
+    changed = get_changed_stages(
+        STAGES, hashes, hashes, existing_stages={"changed": {}}, incremental=True
+    )
+    assert set(changed) == {"unchanged"}
+
+
+def test_sync_not_incremental():
+    """All stages are regenerated when not syncing incrementally."""
+    hashes = hash_stages({})
+    assert get_changed_stages(STAGES, hashes, hashes, existing_stages=STAGES) == STAGES
+
+
+def test_hash_stage_listings(tmp_path):
+    """Stages are rehashed when files are added to their dependency directories."""
+
+    class Deps(BaseModel):
+        videos: Path = tmp_path
+
+    model = create_model("Listed", deps=(Deps, Deps()))
+    previous_hash = hash_stage(model, {})
+    assert hash_stage(model, {}) == previous_hash
+    (tmp_path / "video.nc").touch()
+    assert hash_stage(model, {}) != previous_hash